@@ -1,29 +1,58 @@
-from app.ports.event_consumer import IEventConsumerPort
-from typing import Callable, Awaitable
+from app.ports.event_consumer import EventsHandler, IEventConsumerPort
+from contextlib import suppress
+from typing import Callable, Hashable
 import aio_pika
 import asyncio
+import logging
 import json
 
+logger = logging.getLogger(__name__)
+
+RETRIES_HEADER = "x-retries"
+
 
 class AioPikaEventConsumerAdapter(IEventConsumerPort):
+    """
+    Упавшее сообщение подтверждается, а его копия уходит в очередь
+    `<queue>.retry` без потребителей: через `retry_delay` секунд брокер по
+    TTL возвращает ее в основную очередь. После `max_retries` попыток, а
+    также если сообщение не удалось разобрать, копия остается в
+    `<queue>.dead` для разбора вручную.
+    """
+
+    RESTART_DELAY = 1.0
+
     def __init__(
         self,
         connection_url: str,
         exchange_name: str = "events",
         queue_name: str = "",
+        prefetch_count: int = 256,
+        workers: int = 8,
+        batch_size: int = 32,
+        retry_delay: float = 30.0,
+        max_retries: int = 5,
     ):
         self.connection_url = connection_url
         self.exchange_name = exchange_name
         self.queue_name = queue_name
+        self.prefetch_count = prefetch_count
+        self.workers = workers
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
 
         self._connection = None
         self._channel = None
         self._exchange = None
         self._queue = None
+        self._retry_queue = None
+        self._dead_queue = None
 
     async def connect(self):
         self._connection = await aio_pika.connect_robust(self.connection_url)
         self._channel = await self._connection.channel()
+        await self._channel.set_qos(prefetch_count=self.prefetch_count)
         self._exchange = await self._channel.declare_exchange(
             self.exchange_name, aio_pika.ExchangeType.TOPIC
         )
@@ -32,23 +61,141 @@ class AioPikaEventConsumerAdapter(IEventConsumerPort):
             self.queue_name or "",
             durable=True,
         )
+        self._retry_queue = await self._channel.declare_queue(
+            f"{self._queue.name}.retry",
+            durable=True,
+            arguments={
+                "x-message-ttl": int(self.retry_delay * 1000),
+                "x-dead-letter-exchange": "",
+                "x-dead-letter-routing-key": self._queue.name,
+            },
+        )
+        self._dead_queue = await self._channel.declare_queue(
+            f"{self._queue.name}.dead", durable=True
+        )
+
+    async def _settle(
+        self,
+        message: aio_pika.abc.AbstractIncomingMessage,
+        error: Exception | None,
+        retry: bool = True,
+    ) -> None:
+        try:
+            if error is None:
+                await message.ack()
+                return
+
+            headers = dict(message.headers or {})
+            retries = int(headers.get(RETRIES_HEADER) or 0)  # type: ignore
+            headers[RETRIES_HEADER] = retries + 1
+            target = (
+                self._retry_queue
+                if retry and retries < self.max_retries
+                else self._dead_queue
+            )
+
+            await self._channel.default_exchange.publish(
+                aio_pika.Message(
+                    message.body,
+                    headers=headers,
+                    content_type=message.content_type,
+                    message_id=message.message_id,
+                    delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                ),
+                routing_key=target.name,
+            )
+            await message.ack()
+        except Exception:
+            logger.exception("Failed to settle message")
+            # копия не ушла: пусть брокер доставит сообщение заново
+            with suppress(Exception):
+                await message.nack(requeue=True)
+
+    async def _work(
+        self,
+        queue: asyncio.Queue,
+        handler: EventsHandler,
+    ) -> None:
+        while True:
+            # забираем то, что уже есть в очереди, но не больше batch_size
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            errors: list[Exception | None]
+            try:
+                errors = await handler([payload for _, payload in batch])
+            except Exception as e:
+                errors = [e] * len(batch)
+
+            # подтверждаем только после того, как обработчик завершился,
+            # и откладываем на повтор только упавшие сообщения
+            for (message, payload), error in zip(batch, errors):
+                if error is not None:
+                    logger.error(
+                        "Failed to handle event %s",
+                        payload.get("event_name"),
+                        exc_info=error,
+                    )
+
+                await self._settle(message, error)
+
+    async def _consume(
+        self,
+        handler: EventsHandler,
+        partition_key: Callable[[dict], Hashable] | None,
+    ) -> None:
+        queues: list[asyncio.Queue] = [
+            asyncio.Queue(
+                maxsize=max(
+                    self.prefetch_count // self.workers, self.batch_size
+                )
+            )
+            for _ in range(self.workers)
+        ]
+
+        async with asyncio.TaskGroup() as group:
+            for queue in queues:
+                group.create_task(self._work(queue, handler))
+
+            async with self._queue.iterator() as queue_iter:
+                async for message in queue_iter:
+                    try:
+                        payload = json.loads(message.body)
+                        key = partition_key(payload) if partition_key else None
+                    except Exception as e:
+                        logger.exception("Failed to decode message")
+                        await self._settle(message, e, retry=False)
+                        continue
+
+                    queue = queues[hash(key) % len(queues)]
+                    await queue.put((message, payload))
 
     async def create_consuming_loop(
         self,
         routing_keys: list[str],
-        handler: Callable[[dict], Awaitable[None]],
+        handler: EventsHandler,
+        partition_key: Callable[[dict], Hashable] | None = None,
     ) -> asyncio.Task:
+        """
+        Сообщения распределяются по `workers` обработчикам по хэшу
+        `partition_key`, поэтому события одной сущности обрабатываются по
+        порядку, а разных - параллельно. Брокер держит у сервиса не больше
+        `prefetch_count` неподтвержденных сообщений, а очереди обработчиков
+        ограничены, так что при медленной обработке чтение останавливается.
+        Обработчик получает до `batch_size` уже вычитанных сообщений за раз.
+        """
         for key in routing_keys:
             await self._queue.bind(self._exchange, routing_key=key)
 
         async def consume():
-            async with self._queue.iterator() as queue_iter:
-                async for message in queue_iter:
-                    async with message.process():
-                        try:
-                            payload = json.loads(message.body)
-                            await handler(payload)
-                        except Exception as e:
-                            print("Error during processing message: ", e)
+            # обработчики сами ловят свои ошибки, а если упадет чтение
+            # из очереди, цикл перезапускается, а не останавливается молча
+            while True:
+                try:
+                    await self._consume(handler, partition_key)
+                except Exception:
+                    logger.exception("Event consuming loop failed")
+                    await asyncio.sleep(self.RESTART_DELAY)
 
         return asyncio.create_task(consume())
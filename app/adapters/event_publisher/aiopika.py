@@ -2,6 +2,7 @@ from app.ports.event_publisher import IEventPublisherPort
 from pydantic import BaseModel
 from uuid import uuid4
 import aio_pika
+import asyncio
 
 from app.ports.event_publisher.dto import EventPayload
 from app.ports.event_publisher.exceptions import (
@@ -18,7 +19,7 @@ class AioPikaEventPublisherAdapter(IEventPublisherPort):
 
     async def connect(self):
         connection = await aio_pika.connect_robust(self.connection_url)
-        self._channel = await connection.channel()
+        self._channel = await connection.channel(publisher_confirms=True)
         self._exchange = await self._channel.declare_exchange(
             self.exchange_name, aio_pika.ExchangeType.TOPIC
         )
@@ -31,9 +32,31 @@ class AioPikaEventPublisherAdapter(IEventPublisherPort):
             event_id=uuid4(), event_name=event_name, data=data.model_dump()
         )
 
-        message = aio_pika.Message(
+        await self._exchange.publish(
+            self._to_message(payload), routing_key=event_name
+        )
+
+    async def publish_batch(self, events: list[EventPayload]) -> None:
+        """
+        Отправляет события без ожидания друг друга и возвращается, когда
+        брокер подтвердил каждое из них.
+        """
+        if not self._exchange:
+            raise EventPublisherNotConnectedException()
+
+        await asyncio.gather(
+            *(
+                self._exchange.publish(
+                    self._to_message(event), routing_key=event.event_name
+                )
+                for event in events
+            )
+        )
+
+    def _to_message(self, payload: EventPayload) -> aio_pika.Message:
+        return aio_pika.Message(
             body=payload.model_dump_json().encode(),
             content_type="application/json",
+            message_id=str(payload.event_id),
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
         )
-
-        await self._exchange.publish(message, routing_key=event_name)
@@ -1,9 +1,13 @@
 from app.ports.hackathonservice.exceptions import HackathonServiceError
 from app.ports.hackathonservice import IHackathonServicePort
 from app.ports.hackathonservice.dto import HackathonDto
+from app.util.circuit_breaker import CircuitBreaker
+from app.util.singleflight import SingleFlight
 from fastapi import HTTPException
 from app.config import Settings
+from typing import Any
 import urllib.parse
+import asyncio
 import httpx
 
 
@@ -17,19 +21,41 @@ class HackathonServiceAdapter(IHackathonServicePort):
         self.headers = {
             "Authorization": f"Bearer {Settings.HACKATHON_SERVICE_API_KEY}"
         }
+        self.deadline = Settings.HACKATHON_SERVICE_DEADLINE
+        self.breaker = CircuitBreaker(
+            failure_rate_threshold=Settings.CIRCUIT_BREAKER_FAILURE_RATE,
+            minimum_calls=Settings.CIRCUIT_BREAKER_MINIMUM_CALLS,
+            window=Settings.CIRCUIT_BREAKER_WINDOW,
+            open_timeout=Settings.CIRCUIT_BREAKER_OPEN_TIMEOUT,
+        )
+        self._flight: SingleFlight[str, dict] = SingleFlight()
 
     async def _do_get(self, url: str) -> dict:
+        return await self._flight.do(url, lambda: self._request("GET", url))
+
+    async def _request(self, method: str, url: str, json: Any = None) -> Any:
+        if not self.breaker.allow():
+            raise HackathonServiceError()
+
+        success = False
         try:
-            response = await self.client.get(url, headers=self.headers)
-            data = response.json()
-            if response.status_code == 200:
-                return data
-            else:
-                raise HTTPException(
-                    status_code=response.status_code, detail=data["detail"]
+            async with asyncio.timeout(self.deadline):
+                response = await self.client.request(
+                    method, url, headers=self.headers, json=json
                 )
-        except httpx.HTTPError as e:
+            data = response.json()
+            success = response.status_code < 500
+        except (httpx.HTTPError, TimeoutError, ValueError):
             raise HackathonServiceError()
+        finally:
+            self.breaker.record(success)
+
+        if response.status_code == 200:
+            return data
+
+        raise HTTPException(
+            status_code=response.status_code, detail=data["detail"]
+        )
 
     async def get_hackathon_data(self, hackathon_id: int) -> HackathonDto:
         data = await self._do_get(
@@ -52,8 +78,3 @@ class HackathonServiceAdapter(IHackathonServicePort):
             )
         )
         return data["can_upload"]
-
-
-async def get_http_client():
-    async with httpx.AsyncClient() as client:
-        yield client
@@ -0,0 +1,99 @@
+from app.ports.hackathonservice import IHackathonServicePort
+from app.ports.hackathonservice.dto import HackathonDto
+from app.util.singleflight import SingleFlight
+from app.events.emitter import Emitter, Events
+from app.util.cache import TTLCache
+from typing import Awaitable
+import asyncio
+
+
+class CachedHackathonServiceAdapter(IHackathonServicePort):
+    """
+    Кэширует данные хакатонов и по ним локально отвечает на
+    `can_edit_team_registry`/`can_upload_submissions`. Устаревшая запись
+    отдается сразу, а обновляется в фоне (stale-while-revalidate). Окна
+    считаются по датам хакатона, а их изменение приходит событием
+    hackathon.updated и сбрасывает запись.
+    """
+
+    def __init__(
+        self,
+        hackathon_service: IHackathonServicePort,
+        max_size: int,
+        ttl: float,
+        stale_ttl: float,
+    ):
+        self.hackathon_service = hackathon_service
+        self.cache: TTLCache[int, HackathonDto] = TTLCache(
+            max_size, ttl, stale_ttl
+        )
+
+        # растет при каждой инвалидации; запрос, начатый до нее, не должен
+        # записать в кэш свой (уже устаревший) результат
+        self._generation = 0
+        self._flight: SingleFlight[tuple[int, int], HackathonDto] = (
+            SingleFlight()
+        )
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    def init_events(self):
+        async def on_hackathon_changed(payload: dict):
+            data: dict | None = payload.get("data", None)
+            if data is None:
+                return
+
+            hackathon_id = data.get("id")
+            if hackathon_id is None:
+                return
+
+            self._generation += 1
+            self.cache.invalidate(hackathon_id)
+
+        Emitter.on(Events.HackathonDeleted, on_hackathon_changed)
+        Emitter.on(Events.HackathonUpdated, on_hackathon_changed)
+
+    async def _fetch(self, hackathon_id: int, generation: int) -> HackathonDto:
+        hackathon = await self.hackathon_service.get_hackathon_data(
+            hackathon_id
+        )
+        if generation == self._generation:
+            self.cache.set(hackathon_id, hackathon)
+        return hackathon
+
+    def _do_fetch(self, hackathon_id: int) -> Awaitable[HackathonDto]:
+        generation = self._generation
+        return self._flight.do(
+            (hackathon_id, generation),
+            lambda: self._fetch(hackathon_id, generation),
+        )
+
+    def _refresh_in_background(self, hackathon_id: int) -> None:
+        async def refresh():
+            try:
+                await self._do_fetch(hackathon_id)
+            except Exception:
+                # оставляем устаревшую запись, повторим при следующем чтении
+                pass
+
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def get_hackathon_data(self, hackathon_id: int) -> HackathonDto:
+        hackathon, is_stale = self.cache.lookup(hackathon_id)
+
+        if hackathon is None:
+            return await self._do_fetch(hackathon_id)
+
+        if is_stale:
+            self._refresh_in_background(hackathon_id)
+
+        return hackathon
+
+    async def can_edit_team_registry(self, hackathon_id: int) -> bool:
+        hackathon = await self.get_hackathon_data(hackathon_id)
+        return hackathon.can_edit_team_registry()
+
+    async def can_upload_submissions(self, hackathon_id: int) -> bool:
+        hackathon = await self.get_hackathon_data(hackathon_id)
+        return hackathon.can_upload_submissions()
@@ -1,54 +1,230 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, BinaryIO, Callable, TypeVar, cast
 from app.ports.storage import IStoragePort
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from app.config import Settings
+import functools
+import asyncio
 import boto3
 import io
 
+T = TypeVar("T")
+
+
+class _RangeReader(io.RawIOBase):
+    """
+    Файл только для чтения поверх объекта S3: каждое чтение - ranged GET,
+    так что скачиваются лишь нужные участки (например, центральный каталог zip).
+    """
+
+    def __init__(self, client, bucket: str, key: str, size: int):
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+        self._size = size
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        else:
+            self._pos = self._size + offset
+
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        if self._pos >= self._size or len(buffer) == 0:
+            return 0
+
+        end = min(self._pos + len(buffer), self._size) - 1
+        response = self._client.get_object(
+            Bucket=self._bucket, Key=self._key, Range=f"bytes={self._pos}-{end}"
+        )
+        data = response["Body"].read()
+
+        buffer[: len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
 
 class S3StorageAdapter(IStoragePort):
-    def __init__(self):
+    """
+    boto3 синхронный, поэтому все вызовы выполняются в отдельном
+    ограниченном пуле потоков и не блокируют event loop.
+    """
+
+    def __init__(self, max_workers: int = Settings.STORAGE_MAX_WORKERS):
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="s3"
+        )
         self.__client = boto3.client(
             "s3",
             endpoint_url=Settings.S3_ENDPOINT,
             aws_access_key_id=Settings.S3_ACCESS_KEY,
             aws_secret_access_key=Settings.S3_SECRET_KEY,
-            config=Config(signature_version="s3v4"),
+            config=Config(
+                signature_version="s3v4", max_pool_connections=max_workers
+            ),
             region_name="us-east-1",
         )
+        # большие файлы читаются и отправляются частями, так что в памяти
+        # одновременно не больше chunksize * max_concurrency байт на загрузку
+        self.__transfer_config = TransferConfig(
+            multipart_threshold=Settings.STORAGE_MULTIPART_THRESHOLD,
+            multipart_chunksize=Settings.STORAGE_MULTIPART_CHUNK_SIZE,
+            max_concurrency=Settings.STORAGE_MULTIPART_CONCURRENCY,
+        )
+
+    async def __run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.__executor, functools.partial(fn, *args, **kwargs)
+        )
 
-    def upload_jpeg(self, buf: io.BytesIO, bucket: str, key: str) -> None:
-        self.__client.upload_fileobj(
+    async def upload_jpeg(self, buf: io.BytesIO, bucket: str, key: str) -> None:
+        await self.__run(
+            self.__client.upload_fileobj,
             buf,
             bucket,
             key,
             ExtraArgs={"ContentType": "image/jpeg"},
         )
 
-    def upload_file(
-        self, buf: io.BytesIO, bucket: str, key: str, content_type: str
+    async def upload_file(
+        self, buf: BinaryIO, bucket: str, key: str, content_type: str
     ) -> None:
-        self.__client.upload_fileobj(
+        await self.__run(
+            self.__client.upload_fileobj,
             buf,
             bucket,
             key,
             ExtraArgs={"ContentType": content_type},
+            Config=self.__transfer_config,
         )
 
-    def delete_object(self, bucket: str, key: str) -> None:
-        self.__client.delete_object(Bucket=bucket, Key=key)
+    async def copy_object(
+        self,
+        bucket: str,
+        source_key: str,
+        key: str,
+        content_type: str,
+        if_match: str | None = None,
+    ) -> bool:
+        """
+        Копирует объект внутри бакета (для больших объектов - по частям).
+        С `if_match` копирование выполняется, только если ETag источника не
+        изменился; иначе возвращается False.
+        """
+        extra_args = {
+            "ContentType": content_type,
+            "MetadataDirective": "REPLACE",
+        }
+        if if_match is not None:
+            extra_args["CopySourceIfMatch"] = if_match
 
-    def object_exists(self, bucket: str, key: str) -> bool:
         try:
-            self.__client.head_object(Bucket=bucket, Key=key)
+            await self.__run(
+                self.__client.copy,
+                {"Bucket": bucket, "Key": source_key},
+                bucket,
+                key,
+                ExtraArgs=extra_args,
+                Config=self.__transfer_config,
+            )
+        except self.__client.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] in ("PreconditionFailed", "412"):
+                return False
+            raise
+
+        return True
+
+    async def delete_object(self, bucket: str, key: str) -> None:
+        await self.__run(self.__client.delete_object, Bucket=bucket, Key=key)
+
+    async def object_exists(self, bucket: str, key: str) -> bool:
+        try:
+            await self.__run(self.__client.head_object, Bucket=bucket, Key=key)
             return True
         except self.__client.exceptions.ClientError:
             return False
 
-    def get_object(self, bucket: str, key: str) -> dict:
-        return self.__client.get_object(Bucket=bucket, Key=key)
+    async def head_object(self, bucket: str, key: str) -> dict | None:
+        try:
+            return await self.__run(
+                self.__client.head_object, Bucket=bucket, Key=key
+            )
+        except self.__client.exceptions.ClientError:
+            return None
+
+    async def inspect_object(
+        self, bucket: str, key: str, size: int, fn: Callable[[BinaryIO], T]
+    ) -> T:
+        def inspect() -> T:
+            reader = io.BufferedReader(
+                _RangeReader(self.__client, bucket, key, size),
+                buffer_size=8 * 1024,
+            )
+            return fn(cast(BinaryIO, reader))
+
+        return await self.__run(inspect)
+
+    async def generate_upload_url(
+        self, bucket: str, key: str, content_type: str, expires_in: int
+    ) -> str:
+        # подпись считается локально, без обращения к S3
+        return self.__client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": bucket, "Key": key, "ContentType": content_type},
+            ExpiresIn=expires_in,
+        )
+
+    async def generate_download_url(
+        self, bucket: str, key: str, content_disposition: str, expires_in: int
+    ) -> str:
+        return self.__client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": bucket,
+                "Key": key,
+                "ResponseContentDisposition": content_disposition,
+            },
+            ExpiresIn=expires_in,
+        )
+
+    async def get_object(
+        self, bucket: str, key: str, range: str | None = None
+    ) -> dict:
+        params = {"Bucket": bucket, "Key": key}
+        if range is not None:
+            params["Range"] = range
+
+        return await self.__run(self.__client.get_object, **params)
 
-    def ensure_bucket(self, bucket: str) -> None:
-        if self.__client.bucket_exists(bucket):
-            return
+    async def iter_body(
+        self, body, chunk_size: int = 64 * 1024
+    ) -> AsyncIterator[bytes]:
+        try:
+            while chunk := await self.__run(body.read, chunk_size):
+                yield chunk
+        finally:
+            await self.__run(body.close)
+
+    async def ensure_bucket(self, bucket: str) -> None:
+        try:
+            await self.__run(self.__client.head_bucket, Bucket=bucket)
+        except self.__client.exceptions.ClientError:
+            raise RuntimeError(f"Необходимо определить бакет {bucket}!")
 
-        raise RuntimeError(f"Необходимо определить бакет {bucket}!")
+    def close(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
@@ -1,12 +1,20 @@
-from app.ports.userservice.exceptions import UserServiceError
 from app.ports.userservice.dto import ExternalUserDto
 from app.ports.userservice import IUserServicePort
+from app.util.batching import BatchLoader
+from app.util.circuit_breaker import CircuitBreaker
+from app.util.singleflight import SingleFlight
 from fastapi import HTTPException
 from app.config import Settings
 from typing import Any
 import urllib.parse
+import asyncio
 import httpx
 
+from app.ports.userservice.exceptions import (
+    UserNotFoundException,
+    UserServiceError,
+)
+
 
 class UserServiceAdapter(IUserServicePort):
     def __init__(
@@ -18,48 +26,66 @@ class UserServiceAdapter(IUserServicePort):
         self.headers = {
             "Authorization": f"Bearer {Settings.USER_SERVICE_API_KEY}"
         }
+        self.deadline = Settings.USER_SERVICE_DEADLINE
+        self.breaker = CircuitBreaker(
+            failure_rate_threshold=Settings.CIRCUIT_BREAKER_FAILURE_RATE,
+            minimum_calls=Settings.CIRCUIT_BREAKER_MINIMUM_CALLS,
+            window=Settings.CIRCUIT_BREAKER_WINDOW,
+            open_timeout=Settings.CIRCUIT_BREAKER_OPEN_TIMEOUT,
+        )
+        self._many_flight: SingleFlight[frozenset[int], Any] = SingleFlight()
+        self._loader: BatchLoader[int, ExternalUserDto] = BatchLoader(
+            self._load_users,
+            # как и прежний GET /{id}, отсутствующий пользователь - это 404
+            UserNotFoundException,
+            window=Settings.USER_SERVICE_BATCH_WINDOW_MS / 1000,
+            max_batch_size=Settings.USER_SERVICE_BATCH_MAX_SIZE,
+        )
 
-    async def _do_get(self, url: str) -> dict:
-        try:
-            response = await self.client.get(url, headers=self.headers)
-            data = response.json()
-            if response.status_code == 200:
-                return data
-            else:
-                raise HTTPException(
-                    status_code=response.status_code, detail=data["detail"]
-                )
-        except httpx.HTTPError as e:
+    async def _request(self, method: str, url: str, json: Any = None) -> Any:
+        if not self.breaker.allow():
             raise UserServiceError()
 
-    async def _do_post(self, url: str, json: Any) -> Any:
+        success = False
         try:
-            response = await self.client.post(
-                url,
-                headers=self.headers,
-                json=json,
-            )
-            data = response.json()
-            if response.status_code == 200:
-                return data
-            else:
-                raise HTTPException(
-                    status_code=response.status_code, detail=data["detail"]
+            async with asyncio.timeout(self.deadline):
+                response = await self.client.request(
+                    method, url, headers=self.headers, json=json
                 )
-        except httpx.HTTPError as e:
+            data = response.json()
+            success = response.status_code < 500
+        except (httpx.HTTPError, TimeoutError, ValueError):
             raise UserServiceError()
+        finally:
+            self.breaker.record(success)
 
-    async def get_user_info(self, user_id: int) -> ExternalUserDto:
-        data = await self._do_get(
-            urllib.parse.urljoin(self.base_url, str(user_id))
+        if response.status_code == 200:
+            return data
+
+        raise HTTPException(
+            status_code=response.status_code, detail=data["detail"]
         )
-        return ExternalUserDto(**data)
+
+    async def _do_post(self, url: str, json: Any) -> Any:
+        return await self._request("POST", url, json)
+
+    async def _load_users(
+        self, user_ids: frozenset[int]
+    ) -> dict[int, ExternalUserDto]:
+        users = await self.get_user_info_many(user_ids)
+        return {user.id: user for user in users}
+
+    async def get_user_info(self, user_id: int) -> ExternalUserDto:
+        return await self._loader.load(user_id)
 
     async def get_user_info_many(
         self, user_ids: frozenset[int]
     ) -> list[ExternalUserDto]:
-        data: list[dict[str, Any]] = await self._do_post(
-            urllib.parse.urljoin(self.base_url, "info-many"),
-            tuple(user_ids),
+        data: list[dict[str, Any]] = await self._many_flight.do(
+            user_ids,
+            lambda: self._do_post(
+                urllib.parse.urljoin(self.base_url, "info-many"),
+                tuple(user_ids),
+            ),
         )
         return [ExternalUserDto(**user) for user in data]
@@ -0,0 +1,63 @@
+from app.ports.userservice.dto import ExternalUserDto
+from app.ports.userservice import IUserServicePort
+from app.events.emitter import Emitter, Events
+from app.util.cache import TTLCache
+
+
+class CachedUserServiceAdapter(IUserServicePort):
+    def __init__(
+        self,
+        user_service: IUserServicePort,
+        max_size: int,
+        ttl: float,
+    ):
+        self.user_service = user_service
+        self.base_url = user_service.base_url
+        self.cache: TTLCache[int, ExternalUserDto] = TTLCache(max_size, ttl)
+
+    def init_events(self):
+        async def on_user_changed(payload: dict):
+            data: dict | None = payload.get("data", None)
+            if data is None:
+                return
+
+            user_id = data.get("id")
+            if user_id is None:
+                return
+
+            self.cache.invalidate(user_id)
+
+        Emitter.on(Events.UserDeleted, on_user_changed)
+        Emitter.on(Events.UserBanned, on_user_changed)
+
+    async def get_user_info(self, user_id: int) -> ExternalUserDto:
+        user = self.cache.get(user_id)
+        if user is not None:
+            return user
+
+        user = await self.user_service.get_user_info(user_id)
+        self.cache.set(user_id, user)
+        return user
+
+    async def get_user_info_many(
+        self, user_ids: frozenset[int]
+    ) -> list[ExternalUserDto]:
+        users: list[ExternalUserDto] = []
+        missing_ids: set[int] = set()
+
+        for user_id in user_ids:
+            user = self.cache.get(user_id)
+            if user is None:
+                missing_ids.add(user_id)
+            else:
+                users.append(user)
+
+        if missing_ids:
+            fetched = await self.user_service.get_user_info_many(
+                frozenset(missing_ids)
+            )
+            for user in fetched:
+                self.cache.set(user.id, user)
+            users.extend(fetched)
+
+        return users
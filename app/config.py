@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Literal
 
 
 class TeamServiceSettings(BaseSettings):
@@ -24,5 +25,55 @@ class TeamServiceSettings(BaseSettings):
     INTERNAL_API_KEY: str = "apikey"
     PUBLIC_API_URL: str = "http://localhost/team"
 
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_HTTP2: bool = False
+    HTTP_CONNECT_TIMEOUT: float = 3.0
+    HTTP_READ_TIMEOUT: float = 10.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+
+    USER_SERVICE_DEADLINE: float = 2.0
+    HACKATHON_SERVICE_DEADLINE: float = 2.0
+    FANOUT_DEADLINE: float = 3.0
+
+    EVENT_CONSUMER_PREFETCH: int = 256
+    EVENT_CONSUMER_WORKERS: int = 8
+    EVENT_CONSUMER_BATCH_SIZE: int = 32
+    EVENT_CONSUMER_RETRY_DELAY: float = 30.0
+    EVENT_CONSUMER_MAX_RETRIES: int = 5
+
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 0.5
+    OUTBOX_RETENTION_DAYS: int = 7
+    OUTBOX_PUBLISH_TIMEOUT: float = 10.0
+
+    CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5
+    CIRCUIT_BREAKER_MINIMUM_CALLS: int = 10
+    CIRCUIT_BREAKER_WINDOW: float = 30.0
+    CIRCUIT_BREAKER_OPEN_TIMEOUT: float = 15.0
+
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_TTL: float = 60.0
+
+    HACKATHON_CACHE_MAX_SIZE: int = 1_000
+    HACKATHON_CACHE_TTL: float = 30.0
+    HACKATHON_CACHE_STALE_TTL: float = 300.0
+
+    USER_SERVICE_BATCH_WINDOW_MS: float = 0.0
+    USER_SERVICE_BATCH_MAX_SIZE: int = 100
+
+    STORAGE_MAX_WORKERS: int = 16
+    STORAGE_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    STORAGE_MULTIPART_CHUNK_SIZE: int = 8 * 1024 * 1024
+    STORAGE_MULTIPART_CONCURRENCY: int = 4
+
+    SUBMISSION_UPLOAD_URL_TTL: int = 900
+    SUBMISSION_DOWNLOAD_MODE: Literal["proxy", "redirect"] = "proxy"
+    SUBMISSION_DOWNLOAD_URL_TTL: int = 60
+    SUBMISSION_CACHE_DIR: str = "/tmp/teamservice/submissions"
+    SUBMISSION_CACHE_MAX_SIZE: int = 1024 * 1024 * 1024
+    SUBMISSION_EXPORT_CONCURRENCY: int = 4
+
 
 Settings = TeamServiceSettings()
@@ -0,0 +1,137 @@
+from app.adapters.event_consumer.aiopika import AioPikaEventConsumerAdapter
+from app.adapters.event_publisher.aiopika import AioPikaEventPublisherAdapter
+from app.services.hackathon_teams.interface import IHackathonTeamsService
+from app.services.hackathon_teams.service import HackathonTeamsService
+from app.adapters.hackathonservice.cached import CachedHackathonServiceAdapter
+from app.adapters.hackathonservice import HackathonServiceAdapter
+from app.ports.hackathonservice import IHackathonServicePort
+from app.services.brand_team.interface import ITeamService
+from app.ports.event_publisher import IEventPublisherPort
+from app.ports.event_consumer import IEventConsumerPort
+from app.services.invite.interface import IInviteService
+from app.adapters.userservice.cached import CachedUserServiceAdapter
+from app.adapters.userservice import UserServiceAdapter
+from app.services.brand_team.service import TeamService
+from app.services.invite.service import InviteService
+from app.services.mate.interface import IMateService
+from app.ports.userservice import IUserServicePort
+from app.services.mate.service import MateService
+from app.adapters.storage import S3StorageAdapter
+from app.util.disk_cache import DiskLRUCache
+from app.ports.storage import IStoragePort
+from app.events.emitter import BatchHandlers, Emitter
+from app.events.outbox import OutboxRelay
+from app.config import Settings
+from datetime import timedelta
+import httpx
+
+from app.services.hackathon_team_submissions.interface import (
+    IHackathonTeamSubmissionsService,
+)
+from app.services.hackathon_team_submissions.service import (
+    HackathonTeamSubmissionsService,
+)
+
+
+class Container:
+    """
+    Граф адаптеров и сервисов приложения. Собирается один раз за время жизни
+    процесса (в lifespan) и переиспользуется всеми запросами. HTTP-клиенты
+    открываются и закрываются в lifespan.
+    """
+
+    def __init__(
+        self,
+        user_http_client: httpx.AsyncClient,
+        hackathon_http_client: httpx.AsyncClient,
+    ):
+        self.user_http_client = user_http_client
+        self.hackathon_http_client = hackathon_http_client
+
+        self.storage: IStoragePort = S3StorageAdapter()
+        self.submission_cache = DiskLRUCache(
+            Settings.SUBMISSION_CACHE_DIR, Settings.SUBMISSION_CACHE_MAX_SIZE
+        )
+        self.event_publisher: IEventPublisherPort = (
+            AioPikaEventPublisherAdapter(Settings.RABBITMQ_URL, "events")
+        )
+        self.event_consumer: IEventConsumerPort = AioPikaEventConsumerAdapter(
+            Settings.RABBITMQ_URL,
+            "events",
+            queue_name="teamservice",
+            prefetch_count=Settings.EVENT_CONSUMER_PREFETCH,
+            workers=Settings.EVENT_CONSUMER_WORKERS,
+            batch_size=Settings.EVENT_CONSUMER_BATCH_SIZE,
+            retry_delay=Settings.EVENT_CONSUMER_RETRY_DELAY,
+            max_retries=Settings.EVENT_CONSUMER_MAX_RETRIES,
+        )
+
+        self.user_adapter = UserServiceAdapter(self.user_http_client)
+        self.user_cache = CachedUserServiceAdapter(
+            self.user_adapter,
+            max_size=Settings.USER_CACHE_MAX_SIZE,
+            ttl=Settings.USER_CACHE_TTL,
+        )
+        self.user_service: IUserServicePort = self.user_cache
+        self.hackathon_adapter = HackathonServiceAdapter(
+            client=self.hackathon_http_client
+        )
+        self.hackathon_cache = CachedHackathonServiceAdapter(
+            self.hackathon_adapter,
+            max_size=Settings.HACKATHON_CACHE_MAX_SIZE,
+            ttl=Settings.HACKATHON_CACHE_TTL,
+            stale_ttl=Settings.HACKATHON_CACHE_STALE_TTL,
+        )
+        self.hackathon_service: IHackathonServicePort = self.hackathon_cache
+
+        self.mate_service: IMateService = MateService(self.user_service)
+        self.team_service: ITeamService = TeamService(
+            self.user_service, self.mate_service
+        )
+        self.invite_service: IInviteService = InviteService(
+            team_service=self.team_service,
+            user_service=self.user_service,
+            mate_service=self.mate_service,
+        )
+        self.hackathon_team_submissions_service: (
+            IHackathonTeamSubmissionsService
+        ) = HackathonTeamSubmissionsService(
+            self.hackathon_service, self.storage, self.submission_cache
+        )
+        self.hackathon_teams_service: IHackathonTeamsService = (
+            HackathonTeamsService(
+                hackathon_service=self.hackathon_service,
+                brand_mate_service=self.mate_service,
+                brand_team_service=self.team_service,
+                submission_service=self.hackathon_team_submissions_service,
+                user_service=self.user_service,
+            )
+        )
+
+        self.outbox_relay = OutboxRelay(
+            self.event_publisher,
+            batch_size=Settings.OUTBOX_BATCH_SIZE,
+            poll_interval=Settings.OUTBOX_POLL_INTERVAL,
+            retention=timedelta(days=Settings.OUTBOX_RETENTION_DAYS),
+            publish_timeout=Settings.OUTBOX_PUBLISH_TIMEOUT,
+        )
+
+        self._events_initialized = False
+
+    def init_events(self) -> None:
+        if self._events_initialized:
+            return
+
+        self.user_cache.init_events()
+        self.hackathon_cache.init_events()
+        self.team_service.init_events()
+        self.hackathon_teams_service.init_events()
+        self._events_initialized = True
+
+    async def close(self) -> None:
+        self.storage.close()
+
+        if self._events_initialized:
+            Emitter.remove_all_listeners()
+            BatchHandlers.clear()
+            self._events_initialized = False
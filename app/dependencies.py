@@ -1,120 +1,86 @@
-from app.adapters.event_consumer.aiopika import AioPikaEventConsumerAdapter
-from app.adapters.event_publisher.aiopika import AioPikaEventPublisherAdapter
-from app.ports.event_consumer import IEventConsumerPort
 from app.services.hackathon_teams.interface import IHackathonTeamsService
-from app.services.hackathon_teams.service import HackathonTeamsService
-from app.adapters.hackathonservice import HackathonServiceAdapter
 from app.ports.hackathonservice import IHackathonServicePort
 from app.services.brand_team.interface import ITeamService
 from app.ports.event_publisher import IEventPublisherPort
+from app.ports.event_consumer import IEventConsumerPort
 from app.services.invite.interface import IInviteService
-from app.adapters.userservice import UserServiceAdapter
-from app.services.brand_team.service import TeamService
-from app.services.invite.service import InviteService
 from app.services.mate.interface import IMateService
 from app.ports.userservice import IUserServicePort
-from app.services.mate.service import MateService
-from app.adapters.storage import S3StorageAdapter
+from app.util.disk_cache import DiskLRUCache
 from app.ports.storage import IStoragePort
-from app.config import Settings
-from functools import lru_cache
-from fastapi import Depends
-import httpx
+from fastapi import Depends, Request
+from app.container import Container
 
 from app.services.hackathon_team_submissions.interface import (
     IHackathonTeamSubmissionsService,
 )
-from app.services.hackathon_team_submissions.service import (
-    HackathonTeamSubmissionsService,
-)
 
 
-async def get_http_client():
-    return httpx.AsyncClient()
+async def get_container(request: Request) -> Container:
+    return request.app.state.container
+
 
+async def get_storage(
+    container: Container = Depends(get_container),
+) -> IStoragePort:
+    return container.storage
 
-@lru_cache
-def get_storage() -> IStoragePort:
-    return S3StorageAdapter()
 
+async def get_submission_cache(
+    container: Container = Depends(get_container),
+) -> DiskLRUCache:
+    return container.submission_cache
 
-@lru_cache
-def get_event_publisher() -> IEventPublisherPort:
-    return AioPikaEventPublisherAdapter(Settings.RABBITMQ_URL, "events")
 
+async def get_event_publisher(
+    container: Container = Depends(get_container),
+) -> IEventPublisherPort:
+    return container.event_publisher
 
-@lru_cache
-def get_event_consumer() -> IEventConsumerPort:
-    return AioPikaEventConsumerAdapter(
-        Settings.RABBITMQ_URL, "events", queue_name="teamservice"
-    )
 
+async def get_event_consumer(
+    container: Container = Depends(get_container),
+) -> IEventConsumerPort:
+    return container.event_consumer
 
-@lru_cache
-def get_user_service(
-    client: httpx.AsyncClient = Depends(get_http_client),
+
+async def get_user_service(
+    container: Container = Depends(get_container),
 ) -> IUserServicePort:
-    return UserServiceAdapter(client)
+    return container.user_service
 
 
-@lru_cache
-def get_hackathon_service(
-    client: httpx.AsyncClient = Depends(get_http_client),
+async def get_hackathon_service(
+    container: Container = Depends(get_container),
 ) -> IHackathonServicePort:
-    return HackathonServiceAdapter(client=client)
+    return container.hackathon_service
 
 
-@lru_cache
-def get_mate_service(
-    user_service: IUserServicePort = Depends(get_user_service),
+async def get_mate_service(
+    container: Container = Depends(get_container),
 ) -> IMateService:
-    return MateService(user_service)
+    return container.mate_service
 
 
-@lru_cache
-def get_team_service(
-    user_service: IUserServicePort = Depends(get_user_service),
-    mate_service: IMateService = Depends(get_mate_service),
+async def get_team_service(
+    container: Container = Depends(get_container),
 ) -> ITeamService:
-    return TeamService(user_service, mate_service)
+    return container.team_service
 
 
-@lru_cache
-def get_invite_service(
-    team_service: ITeamService = Depends(get_team_service),
-    mate_service: IMateService = Depends(get_mate_service),
+async def get_invite_service(
+    container: Container = Depends(get_container),
 ) -> IInviteService:
-    return InviteService(
-        team_service=team_service,
-        user_service=team_service.user_service,
-        mate_service=mate_service,
-    )
+    return container.invite_service
 
 
-@lru_cache
-def get_hackathon_team_submissions_service(
-    hackathon_service: IHackathonServicePort = Depends(get_hackathon_service),
-    storage: IStoragePort = Depends(get_storage),
+async def get_hackathon_team_submissions_service(
+    container: Container = Depends(get_container),
 ) -> IHackathonTeamSubmissionsService:
-    return HackathonTeamSubmissionsService(hackathon_service, storage)
-
-
-@lru_cache
-def get_hackathon_teams_service(
-    hackathon_service: IHackathonServicePort = Depends(get_hackathon_service),
-    brand_mate_service: IMateService = Depends(get_mate_service),
-    brand_team_service: ITeamService = Depends(get_team_service),
-    submission_service: IHackathonTeamSubmissionsService = Depends(
-        get_hackathon_team_submissions_service
-    ),
-    user_service: IUserServicePort = Depends(get_user_service),
-    event_publisher: IEventPublisherPort = Depends(get_event_publisher),
+    return container.hackathon_team_submissions_service
+
+
+async def get_hackathon_teams_service(
+    container: Container = Depends(get_container),
 ) -> IHackathonTeamsService:
-    return HackathonTeamsService(
-        hackathon_service=hackathon_service,
-        brand_mate_service=brand_mate_service,
-        brand_team_service=brand_team_service,
-        submission_service=submission_service,
-        user_service=user_service,
-        event_publisher=event_publisher,
-    )
+    return container.hackathon_teams_service
@@ -1,13 +1,77 @@
+from app.events.emitter import BatchHandler, BatchHandlers, Emitter, Events
 from app.ports.event_consumer import IEventConsumerPort
-from app.events.emitter import Emitter, Events
+from typing import Hashable
 from asyncio import Task
+import asyncio
 
 
-async def __event_callback(payload: dict):
-    Emitter.emit(payload["event_name"], payload)
+def __partition_key(payload: dict) -> Hashable:
+    # user.deleted и user.banned одного пользователя должны идти по порядку
+    entity = str(payload.get("event_name", "")).split(".")[0]
+    data = payload.get("data")
+    return entity, data.get("id") if isinstance(data, dict) else None
+
+
+async def __gather(*aws) -> None:
+    results = await asyncio.gather(*aws, return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+
+async def dispatch(payload: dict) -> None:
+    """
+    Вызывает всех подписчиков события и дожидается их завершения.
+    """
+    listeners = Emitter.listeners(payload["event_name"])
+    await __gather(*(listener(payload) for listener in listeners))
+
+
+async def dispatch_batch(payloads: list[dict]) -> list[Exception | None]:
+    """
+    Передает каждому пакетному обработчику все его события одним вызовом,
+    после чего по порядку рассылает события обычным подписчикам.
+    Возвращает для каждого события ошибку его обработки или None, чтобы
+    консьюмер вернул в очередь только упавшие события.
+    """
+    errors: list[Exception | None] = [None] * len(payloads)
+
+    batches: dict[BatchHandler, list[int]] = {}
+    for i, payload in enumerate(payloads):
+        for handler in BatchHandlers.get(payload["event_name"], []):
+            batches.setdefault(handler, []).append(i)
+
+    async def run_batch(handler: BatchHandler, indexes: list[int]) -> None:
+        try:
+            await handler([payloads[i] for i in indexes])
+            return
+        except Exception as e:
+            if len(indexes) == 1:
+                errors[indexes[0]] = e
+                return
+
+        # пачка откатилась целиком, по одному находим упавшие события
+        for i in indexes:
+            try:
+                await handler([payloads[i]])
+            except Exception as e:
+                errors[i] = e
+
+    await asyncio.gather(
+        *(run_batch(handler, indexes) for handler, indexes in batches.items())
+    )
+
+    for i, payload in enumerate(payloads):
+        try:
+            await dispatch(payload)
+        except Exception as e:
+            errors[i] = errors[i] or e
+
+    return errors
 
 
 async def register_events(consumer: IEventConsumerPort) -> Task:
     return await consumer.create_consuming_loop(
-        [e.value for e in Events], __event_callback
+        [e.value for e in Events], dispatch_batch, __partition_key
     )
@@ -1,4 +1,6 @@
 from pyee.asyncio import AsyncIOEventEmitter
+from typing import Awaitable, Callable
+from collections import defaultdict
 from enum import StrEnum
 
 
@@ -7,6 +9,36 @@ class Events(StrEnum):
     UserDeleted = "user.deleted"
     TeamHackathonTeamDeleted = "team.hackathon_team_deleted"
     HackathonDeleted = "hackathon.deleted"
+    HackathonUpdated = "hackathon.updated"
 
 
+BatchHandler = Callable[[list[dict]], Awaitable[None]]
+
 Emitter = AsyncIOEventEmitter()
+
+# обработчики, получающие сразу пачку событий, вычитанных консьюмером
+BatchHandlers: defaultdict[str, list[BatchHandler]] = defaultdict(list)
+
+
+def on_batch(events: list[Events], handler: BatchHandler) -> None:
+    for event in events:
+        BatchHandlers[event].append(handler)
+
+
+def get_removed_user_ids(payloads: list[dict]) -> set[int]:
+    """
+    ID пользователей из user.deleted и user.banned (с is_banned = true).
+    """
+    user_ids = set()
+    for payload in payloads:
+        data: dict | None = payload.get("data", None)
+        if data is None or data.get("id") is None:
+            continue
+
+        is_banned = data.get("is_banned")
+        if payload["event_name"] == Events.UserBanned and not is_banned:
+            continue
+
+        user_ids.add(data["id"])
+
+    return user_ids
@@ -0,0 +1,121 @@
+from app.ports.event_publisher.dto import EventPayload
+from app.ports.event_publisher import IEventPublisherPort
+from tortoise.transactions import in_transaction
+from app.models.outbox import OutboxEventModel
+from datetime import timedelta
+from pydantic import BaseModel
+from tortoise import timezone
+from uuid import uuid4
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL = 3600.0
+
+
+async def enqueue(event_name: str, data: BaseModel) -> None:
+    """
+    Записывает событие в outbox. Вызывается в той же транзакции, что и
+    изменение данных; в брокер событие отправит OutboxRelay.
+    """
+    await OutboxEventModel.create(
+        event_id=uuid4(),
+        event_name=event_name,
+        data=data.model_dump(mode="json"),
+    )
+
+
+class OutboxRelay:
+    """
+    Фоновая публикация событий из outbox. За проход берется до `batch_size`
+    неотправленных строк (FOR UPDATE SKIP LOCKED, поэтому реплики не мешают
+    друг другу), они публикуются с подтверждением брокера и помечаются
+    отправленными. Если брокер недоступен, транзакция откатывается и события
+    уходят в одном из следующих проходов. Публикация ограничена
+    `publish_timeout`, чтобы зависший брокер не держал блокировки строк.
+    """
+
+    def __init__(
+        self,
+        publisher: IEventPublisherPort,
+        batch_size: int = 100,
+        poll_interval: float = 0.5,
+        retention: timedelta = timedelta(days=7),
+        publish_timeout: float = 10.0,
+    ):
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.publish_timeout = publish_timeout
+
+        self.published_total = 0
+        self.errors_total = 0
+
+        self._purged_at = 0.0
+
+    async def relay_once(self) -> int:
+        async with in_transaction():
+            events = (
+                await OutboxEventModel.filter(sent_at__isnull=True)
+                .order_by("id")
+                .limit(self.batch_size)
+                .select_for_update(skip_locked=True)
+            )
+            if not events:
+                return 0
+
+            async with asyncio.timeout(self.publish_timeout):
+                await self.publisher.publish_batch(
+                    [
+                        EventPayload(
+                            event_id=event.event_id,
+                            event_name=event.event_name,
+                            data=event.data,
+                        )
+                        for event in events
+                    ]
+                )
+            await OutboxEventModel.filter(
+                id__in=[event.id for event in events]
+            ).update(sent_at=timezone.now())
+
+        self.published_total += len(events)
+        return len(events)
+
+    async def purge(self) -> None:
+        await OutboxEventModel.filter(
+            sent_at__lt=timezone.now() - self.retention
+        ).delete()
+        self._purged_at = time.monotonic()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                sent = await self.relay_once()
+                if sent == 0 and time.monotonic() >= (
+                    self._purged_at + PURGE_INTERVAL
+                ):
+                    await self.purge()
+            except Exception:
+                self.errors_total += 1
+                sent = 0
+                logger.exception("Failed to relay outbox events")
+
+            # полная пачка - скорее всего, есть еще события, ждать не нужно
+            if sent < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> asyncio.Task:
+        return asyncio.create_task(self.run())
+
+    async def stats(self) -> dict[str, int]:
+        return {
+            "pending": await OutboxEventModel.filter(
+                sent_at__isnull=True
+            ).count(),
+            "published_total": self.published_total,
+            "errors_total": self.errors_total,
+        }
@@ -1,27 +1,39 @@
-from app.dependencies import get_event_consumer, get_event_publisher
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from app.events import register_events
+from app.util.http import create_http_client
 from app.routers import main_router
+from app.container import Container
 from app.config import Settings
 from fastapi import FastAPI
 from app.db import init_db
+import asyncio
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    consumer = get_event_consumer()
-    publisher = get_event_publisher()
+    async with (
+        create_http_client() as user_http_client,
+        create_http_client() as hackathon_http_client,
+    ):
+        container = Container(user_http_client, hackathon_http_client)
+        app.state.container = container
 
-    await publisher.connect()
-    await consumer.connect()
+        await container.event_publisher.connect()
+        await container.event_consumer.connect()
 
-    task = await register_events(consumer)
+        container.init_events()
+        task = await register_events(container.event_consumer)
+        outbox_task = container.outbox_relay.start()
 
-    yield
+        yield
 
-    task.cancel()
-    await task
+        for background_task in (task, outbox_task):
+            background_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await background_task
+
+        await container.close()
 
 
 app = FastAPI(
@@ -1,2 +1,3 @@
 from .team import *
 from .hackathon_team import *
+from .outbox import *
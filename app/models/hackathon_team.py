@@ -46,3 +46,11 @@ class HackathonTeamSubmissionModel(Model):
     class Meta:
         table = "team_submissions"
         unique_together = (("team_id", "hackathon_id"),)
+
+
+class HackathonParticipantsModel(Model):
+    hackathon_id = fields.IntField(pk=True, generated=False)
+    registered_count = fields.IntField(default=0)
+
+    class Meta:
+        table = "hackathon_participants"
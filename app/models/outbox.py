@@ -0,0 +1,14 @@
+from tortoise.models import Model
+from tortoise import fields
+
+
+class OutboxEventModel(Model):
+    id = fields.BigIntField(pk=True)
+    event_id = fields.UUIDField()
+    event_name = fields.CharField(max_length=255)
+    data = fields.JSONField()
+    created_at = fields.DatetimeField(auto_now_add=True)
+    sent_at = fields.DatetimeField(null=True)
+
+    class Meta:
+        table = "outbox_events"
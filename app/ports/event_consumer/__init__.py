@@ -1,11 +1,15 @@
-from typing import Awaitable, Callable, Protocol
+from typing import Awaitable, Callable, Hashable, Protocol
 import asyncio
 
+# получает пачку событий и возвращает для каждого ошибку обработки или None
+EventsHandler = Callable[[list[dict]], Awaitable[list[Exception | None]]]
+
 
 class IEventConsumerPort(Protocol):
     async def connect(self) -> None: ...
     async def create_consuming_loop(
         self,
         routing_keys: list[str],
-        handler: Callable[[dict], Awaitable[None]],
+        handler: EventsHandler,
+        partition_key: Callable[[dict], Hashable] | None = None,
     ) -> asyncio.Task: ...
@@ -1,3 +1,4 @@
+from app.ports.event_publisher.dto import EventPayload
 from pydantic import BaseModel
 from typing import Protocol
 
@@ -5,3 +6,4 @@ from typing import Protocol
 class IEventPublisherPort(Protocol):
     async def connect(self) -> None: ...
     async def publish(self, event_name: str, data: BaseModel) -> None: ...
+    async def publish_batch(self, events: list[EventPayload]) -> None: ...
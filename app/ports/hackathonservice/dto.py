@@ -1,5 +1,11 @@
+from datetime import datetime, timezone
 from pydantic import BaseModel
-from datetime import datetime
+
+
+def _now_like(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+    return datetime.now(timezone.utc)
 
 
 class HackathonDto(BaseModel):
@@ -11,3 +17,13 @@ class HackathonDto(BaseModel):
     start_date: datetime
     score_start_date: datetime
     end_date: datetime
+
+    # состав команд можно менять только до начала хакатона
+    def can_edit_team_registry(self, now: datetime | None = None) -> bool:
+        now = now or _now_like(self.start_date)
+        return now < self.start_date
+
+    # результаты можно загружать с начала хакатона до начала оценивания
+    def can_upload_submissions(self, now: datetime | None = None) -> bool:
+        now = now or _now_like(self.start_date)
+        return self.start_date <= now < self.score_start_date
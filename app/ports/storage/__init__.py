@@ -1,13 +1,41 @@
-from typing import Protocol
+from typing import AsyncIterator, BinaryIO, Callable, Protocol, TypeVar
 import io
 
+T = TypeVar("T")
+
 
 class IStoragePort(Protocol):
-    def upload_jpeg(self, buf: io.BytesIO, bucket: str, key: str) -> None: ...
-    def upload_file(
-        self, buf: io.BytesIO, bucket: str, key: str, content_type: str
+    async def upload_jpeg(
+        self, buf: io.BytesIO, bucket: str, key: str
+    ) -> None: ...
+    async def upload_file(
+        self, buf: BinaryIO, bucket: str, key: str, content_type: str
     ) -> None: ...
-    def get_object(self, bucket: str, key: str) -> dict: ...
-    def delete_object(self, bucket: str, key: str) -> None: ...
-    def object_exists(self, bucket: str, key: str) -> bool: ...
-    def ensure_bucket(self, bucket: str) -> None: ...
+    async def head_object(self, bucket: str, key: str) -> dict | None: ...
+    async def inspect_object(
+        self, bucket: str, key: str, size: int, fn: Callable[[BinaryIO], T]
+    ) -> T: ...
+    async def generate_upload_url(
+        self, bucket: str, key: str, content_type: str, expires_in: int
+    ) -> str: ...
+    async def generate_download_url(
+        self, bucket: str, key: str, content_disposition: str, expires_in: int
+    ) -> str: ...
+    async def get_object(
+        self, bucket: str, key: str, range: str | None = None
+    ) -> dict: ...
+    def iter_body(
+        self, body, chunk_size: int = 64 * 1024
+    ) -> AsyncIterator[bytes]: ...
+    async def copy_object(
+        self,
+        bucket: str,
+        source_key: str,
+        key: str,
+        content_type: str,
+        if_match: str | None = None,
+    ) -> bool: ...
+    async def delete_object(self, bucket: str, key: str) -> None: ...
+    async def object_exists(self, bucket: str, key: str) -> bool: ...
+    async def ensure_bucket(self, bucket: str) -> None: ...
+    def close(self) -> None: ...
@@ -8,6 +8,11 @@ class UserDoesNotExistException(HTTPException):
         )
 
 
+class UserNotFoundException(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=404, detail="Пользователь не найден!")
+
+
 class UserServiceError(HTTPException):
     def __init__(self):
         super().__init__(
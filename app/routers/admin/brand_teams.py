@@ -5,6 +5,7 @@ from app.routers.mate.dto import MateCaptainRightsDto
 from app.services.mate.interface import IMateService
 from app.routers.admin.dto import ChangeNameDto
 from app.services.mate.dto import TeamMateDto
+from app.util.responses import PydanticJSONResponse
 from app.services.auth import PermittedAction
 from app.acl.permissions import Permissions
 from fastapi import APIRouter, Depends
@@ -22,7 +23,7 @@ async def get_all_teams(
     """
     Возвращает список всех команд.
     """
-    return await team_service.get_all()
+    return PydanticJSONResponse(await team_service.get_all())
 
 
 @router.post("/name", response_model=TeamDto, summary="Изменение названия")
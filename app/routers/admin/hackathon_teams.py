@@ -1,12 +1,23 @@
-from app.dependencies import get_hackathon_teams_service, get_team_service
 from app.services.hackathon_teams.interface import IHackathonTeamsService
 from .dto import AdminAddMateDto, AdminMateCaptainRightsDto
 from app.services.brand_team.interface import ITeamService
 from app.routers.mate.dto import MateRoleDescDto
+from app.util.responses import PydanticJSONResponse
 from app.services.auth import PermittedAction
 from app.acl.permissions import Permissions
+from fastapi.responses import StreamingResponse
 from fastapi import APIRouter, Depends
 
+from app.dependencies import (
+    get_hackathon_team_submissions_service,
+    get_hackathon_teams_service,
+    get_team_service,
+)
+
+from app.services.hackathon_team_submissions.interface import (
+    IHackathonTeamSubmissionsService,
+)
+
 from app.services.hackathon_teams.dto import (
     HackathonTeamWithMatesDto,
     HackathonTeamMateDto,
@@ -32,7 +43,32 @@ async def get_all_teams(
     """
     Возвращает список всех команд для хакатона с заданным ID.
     """
-    return await service.get_hackathon_teams(hackathon_id)
+    return PydanticJSONResponse(await service.get_hackathon_teams(hackathon_id))
+
+
+@router.get(
+    "/{hackathon_id}/submissions/export",
+    response_class=StreamingResponse,
+    summary="Выгрузка всех результатов",
+)
+async def export_submissions(
+    hackathon_id: int,
+    _=Depends(PermittedAction(Permissions.GetAllTeams)),
+    service: IHackathonTeamSubmissionsService = Depends(
+        get_hackathon_team_submissions_service
+    ),
+):
+    """
+    Возвращает zip-архив со всеми результатами команд хакатона.
+    Архив формируется на лету, файлы лежат по путям `<название команды>/<имя файла>`.
+    """
+    return StreamingResponse(
+        await service.export_submissions(hackathon_id),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="hackathon_{hackathon_id}_submissions.zip"'
+        },
+    )
 
 
 @router.get(
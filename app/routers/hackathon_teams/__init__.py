@@ -6,9 +6,12 @@ from app.services.auth.dto import AccessJWTPayloadDto
 from fastapi import APIRouter, Depends, UploadFile
 from app.services.auth import PermittedAction
 from app.acl.permissions import Permissions
-from .dto import CreateHackathonTeamDto
+from .dto import (
+    CreateHackathonTeamDto,
+    SubmissionConfirmDto,
+    SubmissionUploadDto,
+)
 from uuid import uuid4
-import io
 
 from app.dependencies import (
     get_hackathon_team_submissions_service,
@@ -20,6 +23,7 @@ from app.services.hackathon_team_submissions.interface import (
 )
 
 from app.services.hackathon_team_submissions.dto import (
+    HackathonTeamSubmissionUploadDto,
     HackathonTeamSubmissionDto,
 )
 
@@ -28,7 +32,6 @@ from app.services.hackathon_teams.dto import (
     HackathonTeamMateDto,
 )
 
-
 router = APIRouter(tags=["Хакатоновские команды"], prefix="/hackathon")
 
 
@@ -72,8 +75,7 @@ async def get_my_hack_team_info(
     """
     Возвращает полную информацию о хакатоновской команде текущего пользователя (если он в ней состоит).
     """
-    mate = await service.get_mate(user_dto.user_id, hackathon_id)
-    return await service.get_total(mate.team_id)
+    return await service.get_mate_total(user_dto.user_id, hackathon_id)
 
 
 @router.put(
@@ -214,5 +216,64 @@ async def upload_submission(
         hackathon_id,
         filename,
         current_mate.team_id,
-        io.BytesIO(await file.read()),
+        # starlette уже сбросил файл на диск, читаем его частями
+        file.file,
+    )
+
+
+@router.post(
+    "/{hackathon_id}/submission/upload-url",
+    response_model=HackathonTeamSubmissionUploadDto,
+    summary="Получение ссылки для загрузки результатов",
+)
+async def create_submission_upload_url(
+    hackathon_id: int,
+    upload_dto: SubmissionUploadDto,
+    owner_dto: TeamOwnerDto = Depends(get_team_owner),
+    team_service: IHackathonTeamsService = Depends(get_hackathon_teams_service),
+    submission_service: IHackathonTeamSubmissionsService = Depends(
+        get_hackathon_team_submissions_service
+    ),
+):
+    """
+    Возвращает подписанную ссылку для загрузки файла результатов напрямую в хранилище.
+    Файл нужно отправить методом `method` с заголовком `Content-Type`, равным `content_type`,
+    а затем подтвердить загрузку, передав полученный `upload_id`.
+    """
+    current_mate = await team_service.get_mate(
+        owner_dto.user_dto.user_id, hackathon_id
+    )
+
+    return await submission_service.create_upload_url(
+        hackathon_id, upload_dto.filename, current_mate.team_id
+    )
+
+
+@router.post(
+    "/{hackathon_id}/submission/confirm",
+    response_model=HackathonTeamSubmissionDto,
+    summary="Подтверждение загрузки результатов",
+)
+async def confirm_submission_upload(
+    hackathon_id: int,
+    confirm_dto: SubmissionConfirmDto,
+    owner_dto: TeamOwnerDto = Depends(get_team_owner),
+    team_service: IHackathonTeamsService = Depends(get_hackathon_teams_service),
+    submission_service: IHackathonTeamSubmissionsService = Depends(
+        get_hackathon_team_submissions_service
+    ),
+):
+    """
+    Проверяет загруженный по подписанной ссылке файл и сохраняет его как результат команды.
+    Если файл не загружен, то вернется 400. Если тип файла запрещен, то файл будет удален.
+    """
+    current_mate = await team_service.get_mate(
+        owner_dto.user_dto.user_id, hackathon_id
+    )
+
+    return await submission_service.confirm_upload(
+        hackathon_id,
+        confirm_dto.filename,
+        confirm_dto.upload_id,
+        current_mate.team_id,
     )
@@ -1,6 +1,16 @@
 from pydantic import BaseModel
+from uuid import UUID
 
 
 class CreateHackathonTeamDto(BaseModel):
     hackathon_id: int
     mate_user_ids: list[int]
+
+
+class SubmissionUploadDto(BaseModel):
+    filename: str
+
+
+class SubmissionConfirmDto(BaseModel):
+    filename: str
+    upload_id: UUID
@@ -1,8 +1,16 @@
-from app.dependencies import get_hackathon_teams_service, get_team_service
 from app.services.hackathon_teams.interface import IHackathonTeamsService
 from app.services.brand_team.interface import ITeamService
 from .auth import get_token_from_header
 from fastapi import APIRouter, Depends
+from app.util.responses import PydanticJSONResponse
+from app.util.http import get_pool_stats
+from app.container import Container
+
+from app.dependencies import (
+    get_hackathon_teams_service,
+    get_team_service,
+    get_container,
+)
 
 router = APIRouter(
     tags=["Internal"],
@@ -11,6 +19,48 @@ router = APIRouter(
 )
 
 
+@router.get("/metrics/cache")
+async def get_cache_metrics(
+    _=Depends(get_token_from_header),
+    container: Container = Depends(get_container),
+):
+    return {
+        "user": container.user_cache.cache.stats(),
+        "hackathon": container.hackathon_cache.cache.stats(),
+        "submission_files": container.submission_cache.stats(),
+    }
+
+
+@router.get("/metrics/http-pool")
+async def get_http_pool_metrics(
+    _=Depends(get_token_from_header),
+    container: Container = Depends(get_container),
+):
+    return {
+        "user": get_pool_stats(container.user_http_client),
+        "hackathon": get_pool_stats(container.hackathon_http_client),
+    }
+
+
+@router.get("/metrics/circuit-breakers")
+async def get_circuit_breaker_metrics(
+    _=Depends(get_token_from_header),
+    container: Container = Depends(get_container),
+):
+    return {
+        "user": container.user_adapter.breaker.stats(),
+        "hackathon": container.hackathon_adapter.breaker.stats(),
+    }
+
+
+@router.get("/metrics/outbox")
+async def get_outbox_metrics(
+    _=Depends(get_token_from_header),
+    container: Container = Depends(get_container),
+):
+    return await container.outbox_relay.stats()
+
+
 @router.get("/{id}")
 async def get_team_by_id(
     id: int,
@@ -26,7 +76,7 @@ async def get_hackathon_teams(
     _=Depends(get_token_from_header),
     service: IHackathonTeamsService = Depends(get_hackathon_teams_service),
 ):
-    return await service.get_hackathon_teams(hackathon_id)
+    return PydanticJSONResponse(await service.get_hackathon_teams(hackathon_id))
 
 
 @router.post("/hackathon/{hackathon_id}/teams-info-many")
@@ -35,7 +85,9 @@ async def get_hackathon_teams_info(
     _=Depends(get_token_from_header),
     service: IHackathonTeamsService = Depends(get_hackathon_teams_service),
 ):
-    return await service.get_hackathon_teams_many(team_ids)
+    return PydanticJSONResponse(
+        await service.get_hackathon_teams_many(team_ids)
+    )
 
 
 # на самом деле hackathon_id тут не нужен, но нужно соблюдать нейминг
@@ -54,11 +54,11 @@ async def _delete_mate(
     if mate.team_id != team_id:
         raise NotYourMateException()
 
-    await mate_service.remove(user_id)
+    removed_mate = await mate_service.remove(user_id)
     if await mate_service.get_mate_count(team_id) == 0:
         await team_service.delete(team_id)
 
-    return mate
+    return removed_mate
 
 
 @router.delete(
@@ -1,9 +1,16 @@
-from app.dependencies import get_hackathon_team_submissions_service, get_storage
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Request, Response
+from app.util.disk_cache import DiskLRUCache
 from app.ports.storage import IStoragePort
-from fastapi import APIRouter, Depends
+from app.config import Settings
 from urllib.parse import quote
 
+from app.dependencies import (
+    get_hackathon_team_submissions_service,
+    get_submission_cache,
+    get_storage,
+)
+
 from app.services.hackathon_team_submissions.exceptions import (
     HackathonTeamCantUploadSubmissionsException,
 )
@@ -12,29 +19,106 @@ from app.services.hackathon_team_submissions.interface import (
     IHackathonTeamSubmissionsService,
 )
 
+from app.util.http_conditional import (
+    RangeNotSatisfiableError,
+    format_http_date,
+    parse_byte_range,
+    is_not_modified,
+    is_range_fresh,
+    to_utc,
+)
+
 router = APIRouter(prefix="/download", include_in_schema=False)
 
 
 @router.get("/submission/{hackathon_id}/{team_id}")
 async def download_team_submission(
+    request: Request,
     hackathon_id: int,
     team_id: int,
     submission_service: IHackathonTeamSubmissionsService = Depends(
         get_hackathon_team_submissions_service
     ),
     s3_service: IStoragePort = Depends(get_storage),
+    file_cache: DiskLRUCache = Depends(get_submission_cache),
 ):
     submission = await submission_service.get_submission(hackathon_id, team_id)
 
     if submission is None:
         raise HackathonTeamCantUploadSubmissionsException()
 
-    s3_obj = s3_service.get_object("hackathons", submission.s3_key)
+    version = int(to_utc(submission.uploaded_at).timestamp() * 1_000_000)
+    etag = f'"{submission.id}-{version}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_http_date(submission.uploaded_at),
+        "Cache-Control": "private, no-cache",
+        "Accept-Ranges": "bytes",
+    }
+
+    if is_not_modified(request.headers, etag, submission.uploaded_at):
+        return Response(status_code=304, headers=headers)
+
+    content_disposition = f'attachment; filename="{quote(submission.name)}"'
+
+    if Settings.SUBMISSION_DOWNLOAD_MODE == "redirect":
+        url = await s3_service.generate_download_url(
+            "hackathons",
+            submission.s3_key,
+            content_disposition,
+            Settings.SUBMISSION_DOWNLOAD_URL_TTL,
+        )
+        return RedirectResponse(url, status_code=302)
+
+    headers["Content-Disposition"] = content_disposition
+
+    # диапазоны для закэшированного файла FileResponse обработает сам
+    cached_path = file_cache.get(submission.s3_key, str(version))
+    if cached_path is not None:
+        return FileResponse(
+            cached_path, media_type=submission.content_type, headers=headers
+        )
+
+    range_header = request.headers.get("range")
+    if range_header and is_range_fresh(
+        request.headers, etag, submission.uploaded_at
+    ):
+        s3_head = await s3_service.head_object("hackathons", submission.s3_key)
+        if s3_head is None:
+            raise HackathonTeamCantUploadSubmissionsException()
+
+        size = s3_head["ContentLength"]
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except RangeNotSatisfiableError:
+            return Response(
+                status_code=416, headers={"Content-Range": f"bytes */{size}"}
+            )
+
+        if byte_range is not None:
+            start, end = byte_range
+            s3_obj = await s3_service.get_object(
+                "hackathons", submission.s3_key, range=f"bytes={start}-{end}"
+            )
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+
+            return StreamingResponse(
+                s3_service.iter_body(s3_obj["Body"]),
+                status_code=206,
+                media_type=s3_obj["ContentType"],
+                headers=headers,
+            )
+
+    s3_obj = await s3_service.get_object("hackathons", submission.s3_key)
+    headers["Content-Length"] = str(s3_obj["ContentLength"])
 
     return StreamingResponse(
-        s3_obj["Body"],
+        file_cache.tee(
+            submission.s3_key,
+            str(version),
+            s3_service.iter_body(s3_obj["Body"]),
+        ),
         media_type=s3_obj["ContentType"],
-        headers={
-            "Content-Disposition": f'attachment; filename="{quote(submission.name)}"'
-        },
+        headers=headers,
     )
@@ -9,6 +9,7 @@ class ITeamService(Protocol):
     user_service: IUserServicePort
     mate_service: IMateService
 
+    def init_events(self) -> None: ...
     async def get_team_by_id(self, team_id: int) -> TeamDto: ...
     async def get_name_map(self) -> defaultdict[int, str | None]: ...
     async def exists(self, team_id: int) -> bool: ...
@@ -3,10 +3,12 @@ from app.services.mate.exceptions import AlreadyTeamMemberException
 from app.services.brand_team.dto import TeamDto, TeamWithMatesDto
 from app.services.brand_team.interface import ITeamService
 from app.services.mate.interface import IMateService
+from app.models.team import TeamMatesModel, TeamModel
+from app.events.emitter import get_removed_user_ids
 from app.ports.userservice import IUserServicePort
-from app.events.emitter import Emitter, Events
+from tortoise.transactions import in_transaction
+from app.events.emitter import Events, on_batch
 from tortoise.exceptions import IntegrityError
-from app.models.team import TeamModel
 from collections import defaultdict
 
 from app.services.brand_team.exceptions import (
@@ -24,34 +26,36 @@ class TeamService(ITeamService):
         self.user_service = user_service
         self.mate_service = mate_service
 
-        self._init_events()
-
-    def _init_events(self):
-        async def on_user_deleted(payload: dict):
-            data: dict | None = payload.get("data", None)
-            if data is None:
-                return
-
-            user_id = data.get("id")
-            if user_id is None:
-                return
-
-            mate = await self.mate_service.get_mate(user_id)
-            if mate is None:
+    def init_events(self):
+        async def on_users_deleted(payloads: list[dict]):
+            user_ids = get_removed_user_ids(payloads)
+            if user_ids:
+                await self._remove_users(user_ids)
+
+        on_batch([Events.UserDeleted, Events.UserBanned], on_users_deleted)
+
+    async def _remove_users(self, user_ids: set[int]) -> None:
+        # удаляет участников пачкой и затем все опустевшие команды
+        async with in_transaction():
+            mates = await TeamMatesModel.filter(
+                user_id__in=user_ids
+            ).select_for_update()
+            if not mates:
                 return
 
-            await self.mate_service.remove(user_id, silent=True)
-
-            if await self.mate_service.get_mate_count(mate.team_id) == 0:
-                await self.delete(mate.team_id)
-
-        async def on_user_banned(payload: dict):
-            is_banned = payload["data"]["is_banned"]
-            if is_banned:
-                return await on_user_deleted(payload)
-
-        Emitter.on(Events.UserDeleted, on_user_deleted)
-        Emitter.on(Events.UserBanned, on_user_banned)
+            team_ids = {
+                mate.team_id for mate in mates  # type: ignore[attr-defined]
+            }
+            await TeamMatesModel.filter(
+                id__in=[mate.id for mate in mates]
+            ).delete()
+
+            non_empty = set(
+                await TeamMatesModel.filter(team_id__in=team_ids)
+                .distinct()
+                .values_list("team_id", flat=True)
+            )
+            await TeamModel.filter(id__in=team_ids - non_empty).delete()
 
     async def _get_team_by_id(self, team_id: int) -> TeamModel:
         team = await TeamModel.get_or_none(id=team_id)
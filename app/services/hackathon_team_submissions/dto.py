@@ -1,5 +1,6 @@
 from app.models.hackathon_team import HackathonTeamSubmissionModel
 from datetime import datetime
+from uuid import UUID
 from pydantic import BaseModel
 
 
@@ -27,3 +28,11 @@ class HackathonTeamSubmissionDto(BaseModel):
             uploaded_at=submission.uploaded_at,
             url=url,
         )
+
+
+class HackathonTeamSubmissionUploadDto(BaseModel):
+    upload_id: UUID
+    url: str
+    method: str = "PUT"
+    content_type: str
+    expires_in: int
@@ -15,3 +15,11 @@ class HackathonFileTypeRestrictedException(HTTPException):
             status_code=400,
             detail="Данный тип файла запрещен к загрузке!",
         )
+
+
+class HackathonTeamSubmissionNotUploadedException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=400,
+            detail="Файл результатов не был загружен в хранилище!",
+        )
@@ -1,9 +1,11 @@
 from app.ports.hackathonservice import IHackathonServicePort
+from app.util.disk_cache import DiskLRUCache
 from app.ports.storage import IStoragePort
-from typing import Protocol
-import io
+from typing import AsyncIterator, BinaryIO, Protocol
+from uuid import UUID
 
 from app.services.hackathon_team_submissions.dto import (
+    HackathonTeamSubmissionUploadDto,
     HackathonTeamSubmissionDto,
 )
 
@@ -11,13 +13,26 @@ from app.services.hackathon_team_submissions.dto import (
 class IHackathonTeamSubmissionsService(Protocol):
     hackathon_service: IHackathonServicePort
     storage: IStoragePort
+    file_cache: DiskLRUCache
 
     async def get_submission(
         self, hackathon_id: int, team_id: int
     ) -> HackathonTeamSubmissionDto | None: ...
+    async def get_submissions_many(
+        self, hackathon_id: int | None, team_ids: list[int]
+    ) -> dict[int, HackathonTeamSubmissionDto]: ...
     async def upload_team_submission(
-        self, hackathon_id: int, filename: str, team_id: int, file: io.BytesIO
+        self, hackathon_id: int, filename: str, team_id: int, file: BinaryIO
     ) -> HackathonTeamSubmissionDto: ...
+    async def create_upload_url(
+        self, hackathon_id: int, filename: str, team_id: int
+    ) -> HackathonTeamSubmissionUploadDto: ...
+    async def confirm_upload(
+        self, hackathon_id: int, filename: str, upload_id: UUID, team_id: int
+    ) -> HackathonTeamSubmissionDto: ...
+    async def export_submissions(
+        self, hackathon_id: int
+    ) -> AsyncIterator[bytes]: ...
     def generate_redirect_link(
         self,
         base_url: str,
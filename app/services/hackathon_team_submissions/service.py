@@ -1,16 +1,23 @@
 from app.models.hackathon_team import HackathonTeamSubmissionModel
 from app.ports.hackathonservice import IHackathonServicePort
+from app.util.zip_stream import ZipStreamEntry, stream_zip
+from app.util.disk_cache import DiskLRUCache
 from app.ports.storage import IStoragePort
 from app.config import Settings
+from tortoise import timezone
+from typing import AsyncIterator, BinaryIO
+from uuid import UUID, uuid4
 from . import utils
+import functools
 import urllib.parse
-import io
 
 from .dto import (
+    HackathonTeamSubmissionUploadDto,
     HackathonTeamSubmissionDto,
 )
 
 from .exceptions import (
+    HackathonTeamSubmissionNotUploadedException,
     HackathonTeamCantUploadSubmissionsException,
     HackathonFileTypeRestrictedException,
 )
@@ -25,9 +32,11 @@ class HackathonTeamSubmissionsService(IHackathonTeamSubmissionsService):
         self,
         hackathon_service: IHackathonServicePort,
         storage: IStoragePort,
+        file_cache: DiskLRUCache,
     ):
         self.hackathon_service = hackathon_service
         self.storage = storage
+        self.file_cache = file_cache
 
     async def get_submission(
         self, hackathon_id: int, team_id: int
@@ -46,8 +55,32 @@ class HackathonTeamSubmissionsService(IHackathonTeamSubmissionsService):
 
         return None
 
+    async def get_submissions_many(
+        self, hackathon_id: int | None, team_ids: list[int]
+    ) -> dict[int, HackathonTeamSubmissionDto]:
+        if not team_ids:
+            return {}
+
+        query = HackathonTeamSubmissionModel.filter(team_id__in=team_ids)
+        if hackathon_id is not None:
+            query = query.filter(hackathon_id=hackathon_id)
+
+        dtos = [
+            HackathonTeamSubmissionDto.from_tortoise(
+                submission,
+                self.generate_redirect_link(
+                    Settings.PUBLIC_API_URL,
+                    submission.hackathon_id,
+                    submission.team_id,  # type: ignore[attr-defined]
+                ),
+            )
+            for submission in await query
+        ]
+
+        return {dto.team_id: dto for dto in dtos}
+
     async def upload_team_submission(
-        self, hackathon_id: int, filename: str, team_id: int, file: io.BytesIO
+        self, hackathon_id: int, filename: str, team_id: int, file: BinaryIO
     ) -> HackathonTeamSubmissionDto:
         if not await self.hackathon_service.can_upload_submissions(
             hackathon_id
@@ -57,17 +90,160 @@ class HackathonTeamSubmissionsService(IHackathonTeamSubmissionsService):
         if not utils.is_allowed_file(filename, file):
             raise HackathonFileTypeRestrictedException()
 
-        s3_key = f"team_submissions/{hackathon_id}/{team_id}/{filename}"
+        s3_key = self._get_s3_key(hackathon_id, team_id, filename)
         content_type = utils.guess_content_type(filename)
 
         file.seek(0)
-        self.storage.upload_file(file, "hackathons", s3_key, content_type)
+        await self.storage.upload_file(file, "hackathons", s3_key, content_type)
+
+        return await self._save_submission(
+            hackathon_id, team_id, filename, s3_key, content_type
+        )
+
+    async def create_upload_url(
+        self, hackathon_id: int, filename: str, team_id: int
+    ) -> HackathonTeamSubmissionUploadDto:
+        if not await self.hackathon_service.can_upload_submissions(
+            hackathon_id
+        ):
+            raise HackathonTeamCantUploadSubmissionsException()
+
+        if not utils.is_allowed_filename(filename):
+            raise HackathonFileTypeRestrictedException()
+
+        upload_id = uuid4()
+        content_type = utils.guess_content_type(filename)
+        url = await self.storage.generate_upload_url(
+            "hackathons",
+            self._get_staging_s3_key(
+                hackathon_id, team_id, upload_id, filename
+            ),
+            content_type,
+            Settings.SUBMISSION_UPLOAD_URL_TTL,
+        )
+
+        return HackathonTeamSubmissionUploadDto(
+            upload_id=upload_id,
+            url=url,
+            content_type=content_type,
+            expires_in=Settings.SUBMISSION_UPLOAD_URL_TTL,
+        )
+
+    async def confirm_upload(
+        self, hackathon_id: int, filename: str, upload_id: UUID, team_id: int
+    ) -> HackathonTeamSubmissionDto:
+        """
+        Клиент загружает файл во временный ключ, а подписанная ссылка остается
+        действительной и после подтверждения. Поэтому проверенный объект
+        копируется в постоянный ключ при условии, что его ETag не изменился,
+        и перезапись временного ключа уже ни на что не влияет.
+        """
+        if not await self.hackathon_service.can_upload_submissions(
+            hackathon_id
+        ):
+            raise HackathonTeamCantUploadSubmissionsException()
+
+        staging_key = self._get_staging_s3_key(
+            hackathon_id, team_id, upload_id, filename
+        )
+        s3_obj = await self.storage.head_object("hackathons", staging_key)
+        if s3_obj is None:
+            raise HackathonTeamSubmissionNotUploadedException()
+
+        try:
+            # читаются только первые байты и центральный каталог zip
+            if not await self.storage.inspect_object(
+                "hackathons",
+                staging_key,
+                s3_obj["ContentLength"],
+                lambda file: utils.is_allowed_file(filename, file, strict=True),
+            ):
+                raise HackathonFileTypeRestrictedException()
+
+            s3_key = self._get_s3_key(hackathon_id, team_id, filename)
+            content_type = utils.guess_content_type(filename)
+            if not await self.storage.copy_object(
+                "hackathons",
+                staging_key,
+                s3_key,
+                content_type,
+                if_match=s3_obj["ETag"],
+            ):
+                # объект перезаписали во время проверки
+                raise HackathonTeamSubmissionNotUploadedException()
+        finally:
+            await self.storage.delete_object("hackathons", staging_key)
+
+        return await self._save_submission(
+            hackathon_id, team_id, filename, s3_key, content_type
+        )
+
+    async def export_submissions(
+        self, hackathon_id: int
+    ) -> AsyncIterator[bytes]:
+        submissions = await HackathonTeamSubmissionModel.filter(
+            hackathon_id=hackathon_id
+        ).select_related("team")
+
+        entries = [
+            ZipStreamEntry(
+                "/".join(
+                    (
+                        utils.to_archive_path_part(
+                            submission.team.name,
+                            f"team_{submission.team.id}",
+                        ),
+                        utils.to_archive_path_part(
+                            submission.name, f"submission_{submission.id}"
+                        ),
+                    )
+                ),
+                submission.uploaded_at,
+                functools.partial(self._read_object, submission.s3_key),
+            )
+            for submission in submissions
+        ]
+
+        return stream_zip(entries, Settings.SUBMISSION_EXPORT_CONCURRENCY)
+
+    async def _read_object(self, s3_key: str) -> AsyncIterator[bytes]:
+        s3_obj = await self.storage.get_object("hackathons", s3_key)
+        async for chunk in self.storage.iter_body(s3_obj["Body"]):
+            yield chunk
+
+    def _get_s3_key(
+        self, hackathon_id: int, team_id: int, filename: str
+    ) -> str:
+        filename = utils.to_archive_path_part(filename, "submission")
+        return f"team_submissions/{hackathon_id}/{team_id}/{filename}"
+
+    def _get_staging_s3_key(
+        self, hackathon_id: int, team_id: int, upload_id: UUID, filename: str
+    ) -> str:
+        # неподтвержденные загрузки стоит удалять lifecycle-правилом бакета
+        filename = utils.to_archive_path_part(filename, "submission")
+        return (
+            f"team_submissions/{hackathon_id}/{team_id}/uploads/"
+            f"{upload_id.hex}/{filename}"
+        )
+
+    async def _save_submission(
+        self,
+        hackathon_id: int,
+        team_id: int,
+        filename: str,
+        s3_key: str,
+        content_type: str,
+    ) -> HackathonTeamSubmissionDto:
+        self.file_cache.invalidate(s3_key)
 
         submission, _ = await HackathonTeamSubmissionModel.update_or_create(
             defaults={
                 "name": filename,
                 "s3_key": s3_key,
                 "content_type": content_type,
+                # auto_now_add не обновляет дату при перезаписи
+                "uploaded_at": timezone.now(),
             },
             team_id=team_id,
             hackathon_id=hackathon_id,
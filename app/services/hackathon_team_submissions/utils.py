@@ -1,6 +1,6 @@
 from zipfile import ZipFile
+from typing import BinaryIO
 import mimetypes
-import io
 
 mimetypes.add_type(
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
@@ -21,60 +21,113 @@ def guess_content_type(filename: str) -> str:
     return content_type
 
 
-def is_valid_docx(bytes: io.BytesIO) -> bool:
-    try:
-        with ZipFile(bytes) as file:
-            if (
-                "[Content_Types].xml" not in file.namelist()
-                or "word/document.xml" not in file.namelist()
-            ):
-                return False
-        return True
-    except Exception:
-        return False
+ZIP_SIGNATURE = b"PK\x03\x04"
+
+# обязательные части OOXML-документов внутри zip
+OOXML_PARTS = {
+    "word/document.xml": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "ppt/presentation.xml": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
 
 
-def is_valid_pptx(bytes: io.BytesIO) -> bool:
+def _get_ooxml_type(file: BinaryIO) -> str | None:
+    # ZipFile читает только центральный каталог в конце файла
     try:
-        with ZipFile(bytes) as file:
-            if (
-                "[Content_Types].xml" not in file.namelist()
-                or "ppt/presentation.xml" not in file.namelist()
-            ):
-                return False
-        return True
+        with ZipFile(file) as archive:
+            names = set(archive.namelist())
     except Exception:
-        return False
+        return None
+
+    if "[Content_Types].xml" not in names:
+        return None
+
+    for part, mime_type in OOXML_PARTS.items():
+        if part in names:
+            return mime_type
+
+    return None
+
+
+# сигнатуры в начале файла и типы, которым они соответствуют
+SIGNATURES: dict[bytes, tuple[str, ...]] = {
+    b"\x89PNG\r\n\x1a\n": ("image/png",),
+    b"\xff\xd8\xff": ("image/jpeg",),
+    # составной документ OLE2: .doc и .ppt по сигнатуре не различить
+    b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1": (
+        "application/msword",
+        "application/vnd.ms-powerpoint",
+    ),
+}
+
+TEXT_SNIFF_SIZE = 8 * 1024
+
+# байты, допустимые в тексте (как в file(1)): управляющие символы, кроме
+# табуляции, переводов строк и ESC, встречаются только в бинарных файлах
+TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
+
+
+def _get_mime_types_from_content(file: BinaryIO) -> tuple[str, ...]:
+    file.seek(0)
+    head = file.read(TEXT_SNIFF_SIZE)
+
+    mime_types: tuple[str, ...] = ()
+    if head.startswith(ZIP_SIGNATURE):
+        mime_type = _get_ooxml_type(file)
+        mime_types = (mime_type,) if mime_type else ()
+    else:
+        for signature, signature_types in SIGNATURES.items():
+            if head.startswith(signature):
+                mime_types = signature_types
+                break
+        else:
+            if not head.translate(None, TEXT_BYTES):
+                mime_types = ("text/plain",)
+
+    file.seek(0)
+    return mime_types
+
+
+ALLOWED_MIME_TYPES = [
+    "application/msword",  # .doc
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",  # .docx
+    "application/vnd.ms-powerpoint",  # .ppt
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",  # .pptx
+    "text/plain",  # .txt
+    "image/jpeg",  # jpg/jpeg
+    "image/png",  # png
+]
+
+
+def is_allowed_filename(filename: str) -> bool:
+    # файлы без известного расширения проверяются позже по содержимому
+    mime_type, _ = mimetypes.guess_type(filename)
+    return mime_type is None or mime_type in ALLOWED_MIME_TYPES
+
 
+def is_allowed_file(
+    filename: str, file: BinaryIO, strict: bool = False
+) -> bool:
+    """
+    Без известного расширения тип определяется по содержимому. В режиме
+    `strict` содержимое должно соответствовать типу по расширению.
+    """
+    mime_type, _ = mimetypes.guess_type(filename)
 
-def _get_mime_type_from_content(file_bytes: io.BytesIO) -> str:
-    file_bytes.seek(0)
+    if mime_type is None:
+        return any(
+            content_type in ALLOWED_MIME_TYPES
+            for content_type in _get_mime_types_from_content(file)
+        )
 
-    try:
-        if is_valid_docx(file_bytes):
-            return "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        if is_valid_pptx(file_bytes):
-            return "application/vnd.openxmlformats-officedocument.presentationml.presentation"
-    except Exception:
-        pass
+    if strict and mime_type not in _get_mime_types_from_content(file):
+        return False
 
-    return "unknown"
+    return mime_type in ALLOWED_MIME_TYPES
 
 
-def is_allowed_file(filename: str, file_bytes: io.BytesIO) -> bool:
-    mime_type, _ = mimetypes.guess_type(filename)
+def to_archive_path_part(name: str, fallback: str) -> str:
+    name = name.replace("/", "_").replace("\\", "_").strip()
+    if name in ("", ".", ".."):
+        return fallback
 
-    if mime_type is None:
-        mime_type = _get_mime_type_from_content(file_bytes)
-
-    allowed_mime_types = [
-        "application/msword",  # .doc
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",  # .docx
-        "application/vnd.ms-powerpoint",  # .ppt
-        "application/vnd.openxmlformats-officedocument.presentationml.presentation",  # .pptx
-        "text/plain",  # .txt
-        "image/jpeg",  # jpg/jpeg
-        "image/png",  # png
-    ]
-
-    return mime_type in allowed_mime_types
+    return name
@@ -1,6 +1,5 @@
 from app.ports.hackathonservice import IHackathonServicePort
 from app.services.brand_team.interface import ITeamService
-from app.ports.event_publisher import IEventPublisherPort
 from app.services.mate.interface import IMateService
 from typing import Protocol
 
@@ -20,16 +19,23 @@ class IHackathonTeamsService(Protocol):
     brand_mate_service: IMateService
     brand_team_service: ITeamService
     submission_service: IHackathonTeamSubmissionsService
-    event_publisher: IEventPublisherPort
 
+    def init_events(self) -> None: ...
     async def get_registered_users_count(self, hackathon_id: int) -> int: ...
     async def get_mates(self, team_id: int) -> list[HackathonTeamMateDto]: ...
+    async def get_mate_count(self, team_id: int) -> int: ...
     async def mate_exists(self, user_id: int, hackathon_id: int) -> bool: ...
+    async def any_mate_exists(
+        self, user_ids: list[int], hackathon_id: int
+    ) -> bool: ...
     async def get_mate(
         self, user_id: int, hackathon_id: int
     ) -> HackathonTeamMateDto: ...
     async def get_by_id(self, team_id: int) -> HackathonTeamDto: ...
     async def get_total(self, team_id: int) -> HackathonTeamWithMatesDto: ...
+    async def get_mate_total(
+        self, user_id: int, hackathon_id: int
+    ) -> HackathonTeamWithMatesDto: ...
     async def get_team_by_name_exists(
         self, name: str, hackathon_id: int
     ) -> bool: ...
@@ -1,16 +1,22 @@
 from app.services.hackathon_teams.interface import IHackathonTeamsService
 from app.services.brand_team.exceptions import TeamDoesNotExistException
 from app.ports.hackathonservice import IHackathonServicePort
+from app.ports.hackathonservice.dto import HackathonDto
 from app.services.mate.exceptions import NotAMemberException
 from app.services.brand_team.interface import ITeamService
-from app.ports.event_publisher import IEventPublisherPort
 from app.services.mate.interface import IMateService
 from app.ports.userservice import IUserServicePort
 from tortoise.transactions import in_transaction
-from app.events.emitter import Emitter, Events
+from app.events.emitter import Emitter, Events, on_batch
+from app.events.emitter import get_removed_user_ids
 from app.services.mate.dto import TeamMateDto
+from tortoise.expressions import F
+import app.util.concurrency as concurrency
+import app.events.outbox as outbox
 import app.util.dto_utils as dto_utils
+from collections import Counter
 from typing import cast
+import asyncio
 
 
 from .exceptions import (
@@ -35,6 +41,7 @@ from .dto import (
 )
 
 from app.models.hackathon_team import (
+    HackathonParticipantsModel,
     HackathonTeamMatesModel,
     HackathonTeamModel,
 )
@@ -48,62 +55,141 @@ class HackathonTeamsService(IHackathonTeamsService):
         brand_team_service: ITeamService,
         submission_service: IHackathonTeamSubmissionsService,
         user_service: IUserServicePort,
-        event_publisher: IEventPublisherPort,
     ):
         self.hackathon_service = hackathon_service
         self.brand_mate_service = brand_mate_service
         self.brand_team_service = brand_team_service
         self.submission_service = submission_service
         self.user_service = user_service
-        self.event_publisher = event_publisher
 
-        self._init_events()
+    def init_events(self):
+        async def on_users_deleted(payloads: list[dict]):
+            user_ids = get_removed_user_ids(payloads)
+            if user_ids:
+                await self._remove_users(user_ids)
 
-    def _init_events(self):
-        async def on_user_deleted(payload: dict):
+        async def on_hackathon_deleted(payload: dict):
             data: dict | None = payload.get("data", None)
             if data is None:
                 return
 
-            user_id = data.get("id")
-            if user_id is None:
+            hackathon_id = data.get("id")
+            if hackathon_id is None:
                 return
 
-            mate_data = await HackathonTeamMatesModel.filter(
-                user_id=user_id
-            ).prefetch_related("team")
-            for mate in mate_data:
-                try:
-                    await self.remove_mate(
-                        mate.team.hackathon_id, mate.user_id, silent=True
-                    )
-                except Exception as e:
-                    pass
+            async with in_transaction():
+                await HackathonTeamModel.filter(
+                    hackathon_id=hackathon_id
+                ).delete()
+                await HackathonParticipantsModel.filter(
+                    hackathon_id=hackathon_id
+                ).delete()
 
-        async def on_user_banned(payload: dict):
-            is_banned = payload["data"]["is_banned"]
-            if is_banned:
-                return await on_user_deleted(payload)
+        on_batch([Events.UserDeleted, Events.UserBanned], on_users_deleted)
+        Emitter.on(Events.HackathonDeleted, on_hackathon_deleted)
 
-        async def on_hackathon_deleted(payload: dict):
-            data: dict | None = payload.get("data", None)
-            if data is None:
-                return
+    async def _remove_users(self, user_ids: set[int]) -> None:
+        """
+        Исключает пользователей из всех команд одним проходом: участники и
+        опустевшие команды удаляются пачкой, места возвращаются по хакатонам.
+        Команды хакатонов с закрытой регистрацией не трогаются.
+        """
+        team_hackathons: dict[int, int] = dict(
+            await HackathonTeamMatesModel.filter(
+                user_id__in=user_ids
+            ).values_list("team_id", "team__hackathon_id")
+        )
+        if not team_hackathons:
+            return
+
+        # ошибка проверки пробрасывается, чтобы события обработались заново,
+        # а не считались обработанными, как при закрытой регистрации
+        hackathon_ids = list(set(team_hackathons.values()))
+        can_edit = await asyncio.gather(
+            *(
+                self.hackathon_service.can_edit_team_registry(hackathon_id)
+                for hackathon_id in hackathon_ids
+            )
+        )
+        editable = {
+            hackathon_id
+            for hackathon_id, ok in zip(hackathon_ids, can_edit)
+            if ok
+        }
+        team_ids = {
+            team_id
+            for team_id, hackathon_id in team_hackathons.items()
+            if hackathon_id in editable
+        }
+        if not team_ids:
+            return
 
-            hackathon_id = data.get("id")
-            if hackathon_id is None:
+        async with in_transaction():
+            mates = await HackathonTeamMatesModel.filter(
+                user_id__in=user_ids, team_id__in=team_ids
+            ).select_for_update()
+            if not mates:
                 return
 
-            await HackathonTeamModel.filter(hackathon_id=hackathon_id).delete()
+            await HackathonTeamMatesModel.filter(
+                id__in=[mate.id for mate in mates]
+            ).delete()
 
-        Emitter.on(Events.UserDeleted, on_user_deleted)
-        Emitter.on(Events.UserBanned, on_user_banned)
-        Emitter.on(Events.HackathonDeleted, on_hackathon_deleted)
+            non_empty = set(
+                await HackathonTeamMatesModel.filter(team_id__in=team_ids)
+                .distinct()
+                .values_list("team_id", flat=True)
+            )
+            empty_teams = await HackathonTeamModel.filter(
+                id__in=team_ids - non_empty
+            )
+            await HackathonTeamModel.filter(
+                id__in=[team.id for team in empty_teams]
+            ).delete()
+
+            released = Counter(
+                team_hackathons[mate.team_id]  # type: ignore[attr-defined]
+                for mate in mates
+            )
+            for hackathon_id, count in released.items():
+                await self._release_places(hackathon_id, count)
+
+            for team in empty_teams:
+                await outbox.enqueue(
+                    Events.TeamHackathonTeamDeleted,
+                    HackathonTeamDto.from_tortoise(team),
+                )
 
     async def get_registered_users_count(self, hackathon_id: int) -> int:
-        return await HackathonTeamMatesModel.filter(
-            team__hackathon_id=hackathon_id
-        ).count()
+        counter = await HackathonParticipantsModel.get_or_none(
+            hackathon_id=hackathon_id
+        )
+        return counter.registered_count if counter else 0
+
+    async def _reserve_places(self, hackathon: HackathonDto, count: int):
+        """
+        Атомарно занимает `count` мест в хакатоне. Должен вызываться в той же
+        транзакции, что и добавление участников: при откате места вернутся.
+        """
+        await HackathonParticipantsModel.get_or_create(
+            hackathon_id=hackathon.id
+        )
+
+        reserved = await HackathonParticipantsModel.filter(
+            hackathon_id=hackathon.id,
+            registered_count__lte=hackathon.max_participant_count - count,
+        ).update(registered_count=F("registered_count") + count)
+
+        if reserved == 0:
+            raise TeamDoesNotFitHackathonException()
+
+    async def _release_places(self, hackathon_id: int, count: int):
+        if count == 0:
+            return
+
+        await HackathonParticipantsModel.filter(
+            hackathon_id=hackathon_id
+        ).update(registered_count=F("registered_count") - count)
 
     async def get_mates(self, team_id: int) -> list[HackathonTeamMateDto]:
         mates = await HackathonTeamMatesModel.filter(team_id=team_id)
@@ -125,6 +211,9 @@ class HackathonTeamsService(IHackathonTeamsService):
 
         return dtos
 
+    async def get_mate_count(self, team_id: int) -> int:
+        return await HackathonTeamMatesModel.filter(team_id=team_id).count()
+
     async def _get_mate(
         self, user_id: int, hackathon_id: int
     ) -> HackathonTeamMatesModel:
@@ -141,6 +230,13 @@ class HackathonTeamsService(IHackathonTeamsService):
             user_id=user_id, team__hackathon_id=hackathon_id
         )
 
+    async def any_mate_exists(
+        self, user_ids: list[int], hackathon_id: int
+    ) -> bool:
+        return await HackathonTeamMatesModel.exists(
+            user_id__in=user_ids, team__hackathon_id=hackathon_id
+        )
+
     async def get_mate(
         self, user_id: int, hackathon_id: int
     ) -> HackathonTeamMateDto:
@@ -163,16 +259,14 @@ class HackathonTeamsService(IHackathonTeamsService):
         return team
 
     async def get_by_id(self, team_id: int) -> HackathonTeamDto:
-        team = await self._get_by_id(team_id)
-        hack_info = await self.hackathon_service.try_get_hackathon_data(
-            team.hackathon_id
-        )
-        dto = HackathonTeamDto.from_tortoise(
-            team,
-            submission=await self.submission_service.get_submission(
-                team.hackathon_id, team_id
-            ),
+        return await self._get_dto(await self._get_by_id(team_id))
+
+    async def _get_dto(self, team: HackathonTeamModel) -> HackathonTeamDto:
+        hack_info, submission = await concurrency.gather(
+            self.hackathon_service.try_get_hackathon_data(team.hackathon_id),
+            self.submission_service.get_submission(team.hackathon_id, team.id),
         )
+        dto = HackathonTeamDto.from_tortoise(team, submission=submission)
 
         if hack_info:
             dto.hackathon_name = hack_info.name
@@ -180,30 +274,37 @@ class HackathonTeamsService(IHackathonTeamsService):
         return dto
 
     async def get_total(self, team_id: int) -> HackathonTeamWithMatesDto:
-        team = await self.get_by_id(team_id)
-        mates = await self.get_mates(team_id)
+        return await self._get_total(await self._get_by_id(team_id))
 
-        return HackathonTeamWithMatesDto(
-            **team.model_dump(),
-            mates=mates,
+    async def get_mate_total(
+        self, user_id: int, hackathon_id: int
+    ) -> HackathonTeamWithMatesDto:
+        # команда берется тем же запросом, что и участник, без похода
+        # в сервис пользователей: его данные все равно придут в mates
+        mate = await HackathonTeamMatesModel.get_or_none(
+            user_id=user_id, team__hackathon_id=hackathon_id
+        ).select_related("team")
+        if mate is None:
+            raise NotAMemberException()
+
+        return await self._get_total(mate.team)
+
+    async def _get_total(
+        self, team: HackathonTeamModel
+    ) -> HackathonTeamWithMatesDto:
+        team_dto, mates = await concurrency.gather(
+            self._get_dto(team), self.get_mates(team.id)
         )
 
-    async def _validate_hackathon_limits(
-        self, hackathon_id: int, mates_count: int
-    ):
-        hackathon = await self.hackathon_service.get_hackathon_data(
-            hackathon_id
+        return HackathonTeamWithMatesDto(
+            **team_dto.model_dump(),
+            mates=mates,
         )
 
+    def _validate_team_size(self, hackathon: HackathonDto, mates_count: int):
         if mates_count > hackathon.max_team_mates_count:
             raise CantMakeSuchLargeTeamException()
 
-        if (
-            await self.get_registered_users_count(hackathon_id) + mates_count
-            > hackathon.max_participant_count
-        ):
-            raise TeamDoesNotFitHackathonException()
-
     async def get_team_by_name_exists(
         self, name: str, hackathon_id: int
     ) -> bool:
@@ -238,40 +339,58 @@ class HackathonTeamsService(IHackathonTeamsService):
             if brand_mate.user_id in mate_user_ids
         ]
 
-        for mate in brand_mates:
-            if await self.mate_exists(mate.user_id, hackathon_id):
-                raise UserAlreadyParticipatingInHackathonException()
-
         if len(brand_mates) == 0:
             raise CantCreateEmptyTeamException()
 
+        if await self.any_mate_exists(
+            [mate.user_id for mate in brand_mates], hackathon_id
+        ):
+            raise UserAlreadyParticipatingInHackathonException()
+
         if not any(
             filter(lambda mate: cast(TeamMateDto, mate).is_captain, brand_mates)
         ):
             raise CantCreateTeamWithoutCaptainException()
 
-        await self._validate_hackathon_limits(hackathon_id, len(brand_mates))
+        self._validate_team_size(hackathon_data, len(brand_mates))
 
         async with in_transaction():
+            await self._reserve_places(hackathon_data, len(brand_mates))
+
             hackathon_team = await HackathonTeamModel.create(
                 hackathon_id=hackathon_id, name=brand_team.name
             )
 
-            for mate in brand_mates:
-                await HackathonTeamMatesModel.create(
+            await HackathonTeamMatesModel.bulk_create(
+                [
+                    HackathonTeamMatesModel(
+                        team_id=hackathon_team.id,
+                        user_id=mate.user_id,
+                        is_captain=mate.is_captain,
+                        role_desc=mate.role_desc,
+                    )
+                    for mate in brand_mates
+                ]
+            )
+
+        # имена и аплоады уже подтянуты вместе с брендовой командой
+        return HackathonTeamWithMatesDto(
+            id=hackathon_team.id,
+            hackathon_id=hackathon_id,
+            hackathon_name=hackathon_data.name,
+            name=hackathon_team.name,
+            mates=[
+                HackathonTeamMateDto(
                     team_id=hackathon_team.id,
                     user_id=mate.user_id,
+                    user_name=mate.user_name,
+                    user_uploads=mate.user_uploads,
                     is_captain=mate.is_captain,
                     role_desc=mate.role_desc,
                 )
-
-            return HackathonTeamWithMatesDto(
-                id=hackathon_team.id,
-                hackathon_id=hackathon_id,
-                hackathon_name=hackathon_data.name,
-                name=hackathon_team.name,
-                mates=await self.get_mates(hackathon_team.id),
-            )
+                for mate in brand_mates
+            ],
+        )
 
     async def set_mate_is_captain(
         self, hackathon_id: int, mate_user_id: int, is_captain: bool
@@ -317,10 +436,16 @@ class HackathonTeamsService(IHackathonTeamsService):
 
     async def delete_team(self, team_id: int) -> HackathonTeamDto:
         team = await self._get_by_id(team_id)
-        await team.delete()
-        dto = HackathonTeamDto.from_tortoise(team)
 
-        await self.event_publisher.publish("team.hackathon_team_deleted", dto)
+        async with in_transaction():
+            removed = await HackathonTeamMatesModel.filter(
+                team_id=team_id
+            ).delete()
+            await team.delete()
+            await self._release_places(team.hackathon_id, removed)
+
+            dto = HackathonTeamDto.from_tortoise(team)
+            await outbox.enqueue(Events.TeamHackathonTeamDeleted, dto)
 
         return dto
 
@@ -329,18 +454,22 @@ class HackathonTeamsService(IHackathonTeamsService):
     ) -> HackathonTeamMateDto:
         mate = await self._get_mate(mate_user_id, hackathon_id)
 
+        # участник найден по hackathon_id, так что команду можно не загружать
         if not await self.hackathon_service.can_edit_team_registry(
-            (await mate.team).hackathon_id
+            hackathon_id
         ):
             raise CantEditHackathonTeamsException()
 
         team_id = cast(int, mate.team_id)  # type: ignore[attr-defined]
 
-        total_mates = await self.get_mates(team_id)
-        if len(total_mates) == 1:
+        if await self.get_mate_count(team_id) == 1:
             await self.delete_team(team_id)
         else:
-            await mate.delete()
+            async with in_transaction():
+                removed = await HackathonTeamMatesModel.filter(
+                    id=mate.id
+                ).delete()
+                await self._release_places(hackathon_id, removed)
 
         dto = HackathonTeamMateDto.from_tortoise(mate)
         if not silent:
@@ -357,7 +486,7 @@ class HackathonTeamsService(IHackathonTeamsService):
         to_hackathon_team_id: int,
         mate_user_id: int,
     ) -> HackathonTeamMateDto:
-        hackathon_team = await self.get_by_id(to_hackathon_team_id)
+        hackathon_team = await self._get_by_id(to_hackathon_team_id)
         if not await self.hackathon_service.can_edit_team_registry(
             hackathon_team.hackathon_id
         ):
@@ -366,9 +495,12 @@ class HackathonTeamsService(IHackathonTeamsService):
         if await self.mate_exists(mate_user_id, hackathon_team.hackathon_id):
             raise UserAlreadyParticipatingInHackathonException()
 
-        await self._validate_hackathon_limits(
-            hackathon_team.hackathon_id,
-            len(await self.get_mates(to_hackathon_team_id)) + 1,
+        hackathon_data = await self.hackathon_service.get_hackathon_data(
+            hackathon_team.hackathon_id
+        )
+        self._validate_team_size(
+            hackathon_data,
+            await self.get_mate_count(to_hackathon_team_id) + 1,
         )
 
         brand_mate = await self.brand_mate_service.get_mate(mate_user_id)
@@ -378,12 +510,17 @@ class HackathonTeamsService(IHackathonTeamsService):
         if brand_mate.team_id != from_brand_team_id:
             raise MateTeamMismatchException()
 
-        hackathon_mate = await HackathonTeamMatesModel.create(
-            team_id=to_hackathon_team_id,
-            user_id=mate_user_id,
-            is_captain=brand_mate.is_captain,
-            role_desc=brand_mate.role_desc,
-        )
+        brand_mate = (await self.brand_mate_service.enrich([brand_mate]))[0]
+
+        async with in_transaction():
+            await self._reserve_places(hackathon_data, 1)
+
+            hackathon_mate = await HackathonTeamMatesModel.create(
+                team_id=to_hackathon_team_id,
+                user_id=mate_user_id,
+                is_captain=brand_mate.is_captain,
+                role_desc=brand_mate.role_desc,
+            )
 
         dto = HackathonTeamMateDto.from_tortoise(hackathon_mate)
         dto.user_name = brand_mate.user_name
@@ -418,14 +555,13 @@ class HackathonTeamsService(IHackathonTeamsService):
             hackathon_id
         )
         hackathon_name = hackathon_data.name if hackathon_data else None
+        submissions = await self.submission_service.get_submissions_many(
+            hackathon_id, [team.id for team in teams]
+        )
 
         return [
             HackathonTeamDto.from_tortoise(
-                team,
-                hackathon_name,
-                await self.submission_service.get_submission(
-                    team.hackathon_id, team.id
-                ),
+                team, hackathon_name, submissions.get(team.id)
             )
             for team in teams
         ]
@@ -434,13 +570,11 @@ class HackathonTeamsService(IHackathonTeamsService):
         self, hackathon_team_ids: list[int]
     ) -> list[HackathonTeamDto]:
         teams = await HackathonTeamModel.filter(id__in=hackathon_team_ids)
+        submissions = await self.submission_service.get_submissions_many(
+            None, [team.id for team in teams]
+        )
+
         return [
-            HackathonTeamDto.from_tortoise(
-                team,
-                None,
-                await self.submission_service.get_submission(
-                    team.hackathon_id, team.id
-                ),
-            )
+            HackathonTeamDto.from_tortoise(team, None, submissions.get(team.id))
             for team in teams
         ]
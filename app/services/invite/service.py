@@ -6,6 +6,7 @@ from app.services.mate.interface import IMateService
 from app.ports.userservice import IUserServicePort
 from app.services.invite.dto import TeamInviteDto
 from app.models.team import TeamInvitesModel
+import app.util.concurrency as concurrency
 import app.util.dto_utils as dto_utils
 
 from app.services.invite.exceptions import (
@@ -38,8 +39,10 @@ class InviteService(IInviteService):
         if await self.mate_service.get_mate(user_id):
             raise AlreadyTeamMemberException()
 
-        user_info = await self._get_user_info(user_id)
-        team_info = await self.team_service.get_team_by_id(team_id)
+        user_info, team_info = await concurrency.gather(
+            self._get_user_info(user_id),
+            self.team_service.get_team_by_id(team_id),
+        )
 
         invite = await TeamInvitesModel.create(team_id=team_id, user_id=user_id)
         dto = TeamInviteDto.from_tortoise(invite)
@@ -7,6 +7,7 @@ class IMateService(Protocol):
     user_service: IUserServicePort
 
     async def get_mate(self, user_id: int) -> TeamMateDto | None: ...
+    async def enrich(self, dtos: list[TeamMateDto]) -> list[TeamMateDto]: ...
     async def get_mates(self, team_id: int) -> list[TeamMateDto]: ...
     async def get_mate_count(self, team_id: int) -> int: ...
     async def add(
@@ -35,22 +35,21 @@ class MateService(IMateService):
             raise UserDoesNotExistException()
 
     async def get_mate(self, user_id: int) -> TeamMateDto | None:
+        """
+        Читает только БД. Имя и аплоады участника не заполняются,
+        при необходимости используйте `enrich`.
+        """
         mate = await TeamMatesModel.get_or_none(user_id=user_id)
 
         if not mate:
             return None
 
-        user_info = await self.user_service.try_get_user_info(mate.user_id)
-        dto = TeamMateDto.from_tortoise(mate)
-
-        if user_info:
-            dto.user_uploads = user_info.uploads
+        return TeamMateDto.from_tortoise(mate)
 
-        return dto
+    async def enrich(self, dtos: list[TeamMateDto]) -> list[TeamMateDto]:
+        if not dtos:
+            return dtos
 
-    async def get_mates(self, team_id: int) -> list[TeamMateDto]:
-        mates = await TeamMatesModel.filter(team_id=team_id)
-        dtos = [TeamMateDto.from_tortoise(mate) for mate in mates]
         external_user_info = await self.user_service.try_get_user_info_many(
             dto_utils.export_int_fields(dtos, "user_id")
         )
@@ -67,6 +66,12 @@ class MateService(IMateService):
 
         return dtos
 
+    async def get_mates(self, team_id: int) -> list[TeamMateDto]:
+        mates = await TeamMatesModel.filter(team_id=team_id)
+        return await self.enrich(
+            [TeamMateDto.from_tortoise(mate) for mate in mates]
+        )
+
     async def get_mate_count(self, team_id: int) -> int:
         return await TeamMatesModel.filter(team_id=team_id).count()
 
@@ -137,19 +142,6 @@ class MateService(IMateService):
 
     async def get_captains(self, team_id: int) -> list[TeamMateDto]:
         mates = await TeamMatesModel.filter(team_id=team_id, is_captain=True)
-        dtos = [TeamMateDto.from_tortoise(mate) for mate in mates]
-        external_user_info = await self.user_service.try_get_user_info_many(
-            dto_utils.export_int_fields(dtos, "user_id")
+        return await self.enrich(
+            [TeamMateDto.from_tortoise(mate) for mate in mates]
         )
-        names = self.user_service.get_name_map(external_user_info)
-        user_map = dict((user.id, user) for user in external_user_info)
-
-        dtos = dto_utils.inject_mapping(
-            dtos, names, "user_id", "user_name", strict=True
-        )
-
-        for dto in dtos:
-            if dto.user_id in user_map:
-                dto.user_uploads = user_map[dto.user_id].uploads
-
-        return dtos
@@ -0,0 +1,89 @@
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+import asyncio
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Собирает одиночные запросы, пришедшие за один проход event loop'а
+    (или за окно `window` секунд), и выполняет их одним вызовом `load_many`.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[frozenset[K]], Awaitable[dict[K, V]]],
+        on_missing: Callable[[], Exception],
+        *,
+        window: float = 0.0,
+        max_batch_size: int = 100,
+    ):
+        self.load_many = load_many
+        self.on_missing = on_missing
+        self.window = window
+        self.max_batch_size = max_batch_size
+
+        self._pending: dict[K, asyncio.Future[V]] = {}
+        self._flush_handle: asyncio.Handle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V:
+        future = self._pending.get(key)
+
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._flush_handle is None:
+                if self.window > 0:
+                    self._flush_handle = loop.call_later(
+                        self.window, self._dispatch
+                    )
+                else:
+                    self._flush_handle = loop.call_soon(self._dispatch)
+
+        # отмена одного из ожидающих не должна отменять общий future
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, asyncio.Future[V]]) -> None:
+        try:
+            result = await self.load_many(frozenset(batch))
+        except asyncio.CancelledError:
+            # иначе остальные ожидающие этой пачки зависнут навсегда
+            for future in batch.values():
+                future.cancel()
+            raise
+        except BaseException as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for key, future in batch.items():
+            if future.done():
+                continue
+
+            if key in result:
+                future.set_result(result[key])
+            else:
+                future.set_exception(self.on_missing())
@@ -0,0 +1,81 @@
+from typing import Generic, Hashable, TypeVar
+from collections import OrderedDict
+import time
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    LRU-кэш ограниченного размера, у каждой записи которого есть срок жизни.
+    Если задан `stale_ttl`, то после истечения `ttl` запись еще столько же
+    секунд доступна через `lookup` как устаревшая.
+    """
+
+    def __init__(self, max_size: int, ttl: float, stale_ttl: float = 0.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[K, tuple[float, float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        value, is_stale = self.lookup(key)
+        return None if is_stale else value
+
+    def lookup(self, key: K) -> tuple[V | None, bool]:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None, False
+
+        fresh_until, expires_at, value = entry
+        now = time.monotonic()
+
+        if expires_at <= now:
+            del self._entries[key]
+            self.misses += 1
+            return None, False
+
+        self._entries.move_to_end(key)
+
+        if fresh_until <= now:
+            self.stale_hits += 1
+            return value, True
+
+        self.hits += 1
+        return value, False
+
+    def set(self, key: K, value: V) -> None:
+        if self.max_size <= 0:
+            return
+
+        fresh_until = time.monotonic() + self.ttl
+        self._entries[key] = (fresh_until, fresh_until + self.stale_ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,101 @@
+from collections import deque
+from enum import StrEnum
+import time
+
+
+class CircuitState(StrEnum):
+    Closed = "closed"
+    Open = "open"
+    HalfOpen = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Размыкается, когда доля неудачных вызовов за последние `window` секунд
+    превышает `failure_rate_threshold` (при не менее `minimum_calls` вызовов).
+    В разомкнутом состоянии вызовы сразу отклоняются; через `open_timeout`
+    секунд пропускается один пробный вызов, по результату которого цепь
+    замыкается или снова размыкается.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window: float = 30.0,
+        open_timeout: float = 15.0,
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.open_timeout = open_timeout
+
+        self.state = CircuitState.Closed
+        self.rejected_total = 0
+
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and self._outcomes[0][0] <= now - self.window:
+            self._outcomes.popleft()
+
+    def _open(self, now: float) -> None:
+        self.state = CircuitState.Open
+        self._opened_at = now
+        self._outcomes.clear()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+
+        if (
+            self.state is CircuitState.Open
+            and now >= self._opened_at + self.open_timeout
+        ):
+            self.state = CircuitState.HalfOpen
+            self._probe_in_flight = False
+
+        if self.state is CircuitState.Closed:
+            return True
+
+        if self.state is CircuitState.HalfOpen and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        self.rejected_total += 1
+        return False
+
+    def record(self, success: bool) -> None:
+        now = time.monotonic()
+
+        if self.state is CircuitState.HalfOpen:
+            self._probe_in_flight = False
+            if success:
+                self.state = CircuitState.Closed
+                self._outcomes.clear()
+            else:
+                self._open(now)
+            return
+
+        if self.state is CircuitState.Open:
+            return
+
+        self._outcomes.append((now, success))
+        self._trim(now)
+
+        if len(self._outcomes) < self.minimum_calls:
+            return
+
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        if failures / len(self._outcomes) >= self.failure_rate_threshold:
+            self._open(now)
+
+    def stats(self) -> dict[str, str | int]:
+        self._trim(time.monotonic())
+        return {
+            "state": self.state.value,
+            "calls_in_window": len(self._outcomes),
+            "failures_in_window": sum(1 for _, ok in self._outcomes if not ok),
+            "rejected_total": self.rejected_total,
+        }
@@ -0,0 +1,86 @@
+from typing import Any, Coroutine, TypeVar, overload
+from contextvars import ContextVar
+from fastapi import HTTPException
+from app.config import Settings
+import asyncio
+
+A = TypeVar("A")
+B = TypeVar("B")
+C = TypeVar("C")
+
+# абсолютный срок (loop.time()) ближайшего внешнего gather
+_deadline_at: ContextVar[float | None] = ContextVar(
+    "fanout_deadline_at", default=None
+)
+
+
+class DeadlineExceededException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=504,
+            detail="Не удалось получить данные за отведенное время!",
+        )
+
+
+def _first_leaf(group: BaseExceptionGroup) -> BaseException:
+    exc: BaseException = group
+    while isinstance(exc, BaseExceptionGroup):
+        exc = exc.exceptions[0]
+    return exc
+
+
+@overload
+async def gather(
+    a: Coroutine[Any, Any, A],
+    b: Coroutine[Any, Any, B],
+    /,
+    *,
+    deadline: float | None = ...,
+) -> tuple[A, B]: ...
+
+
+@overload
+async def gather(
+    a: Coroutine[Any, Any, A],
+    b: Coroutine[Any, Any, B],
+    c: Coroutine[Any, Any, C],
+    /,
+    *,
+    deadline: float | None = ...,
+) -> tuple[A, B, C]: ...
+
+
+async def gather(
+    *coros: Coroutine[Any, Any, Any], deadline: float | None = None
+) -> tuple[Any, ...]:
+    """
+    Выполняет независимые операции параллельно в TaskGroup с общим сроком
+    `deadline` (по умолчанию FANOUT_DEADLINE). При первой ошибке остальные
+    задачи отменяются, а наружу пробрасывается само исключение, а не
+    ExceptionGroup, чтобы HTTPException обрабатывались FastAPI как обычно.
+
+    Вложенный gather не может продлить срок внешнего: задачи наследуют
+    абсолютный срок через контекст, и вложенный вызов может его только
+    сократить.
+    """
+    if deadline is None:
+        deadline = Settings.FANOUT_DEADLINE
+
+    deadline_at = asyncio.get_running_loop().time() + deadline
+    outer_deadline_at = _deadline_at.get()
+    if outer_deadline_at is not None:
+        deadline_at = min(deadline_at, outer_deadline_at)
+
+    token = _deadline_at.set(deadline_at)
+    try:
+        async with asyncio.timeout_at(deadline_at):
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(coro) for coro in coros]
+    except TimeoutError:
+        raise DeadlineExceededException()
+    except BaseExceptionGroup as e:
+        raise _first_leaf(e) from None
+    finally:
+        _deadline_at.reset(token)
+
+    return tuple(task.result() for task in tasks)
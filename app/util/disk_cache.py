@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from typing import AsyncIterator
+from pathlib import Path
+from uuid import uuid4
+import hashlib
+import asyncio
+import re
+import os
+
+# имена файлов, которые создает кэш: sha256 и временные файлы tee
+_FILE_NAME_RE = re.compile(r"[0-9a-f]{64}(\.[0-9a-f]{32}\.tmp)?")
+
+
+class DiskLRUCache:
+    """
+    LRU-кэш файлов на диске с ограничением суммарного размера `max_bytes`.
+    На каждый ключ хранится одна версия, запрос другой версии - промах.
+    Индекс живет в памяти процесса, поэтому при создании удаляются оставшиеся
+    от прошлого запуска файлы кэша. Чужие файлы в каталоге не трогаются.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # ключ -> (версия, путь, размер)
+        self._entries: OrderedDict[str, tuple[str, Path, int]] = OrderedDict()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.iterdir():
+            if _FILE_NAME_RE.fullmatch(path.name) and path.is_file():
+                path.unlink(missing_ok=True)
+
+    def _path(self, key: str, version: str) -> Path:
+        digest = hashlib.sha256(f"{key}\0{version}".encode()).hexdigest()
+        return self.directory / digest
+
+    def get(self, key: str, version: str) -> Path | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+
+        # файл могли удалить снаружи (например, очисткой tmp)
+        if not entry[1].exists():
+            self._entries.pop(key)
+            self.size -= entry[2]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def invalidate(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        self.size -= entry[2]
+        entry[1].unlink(missing_ok=True)
+
+    def _add(self, key: str, version: str, path: Path, size: int) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+            if entry[1] != path:
+                entry[1].unlink(missing_ok=True)
+
+        self._entries[key] = (version, path, size)
+        self.size += size
+
+        while self.size > self.max_bytes and len(self._entries) > 1:
+            _, (_, old_path, old_size) = self._entries.popitem(last=False)
+            self.size -= old_size
+            self.evictions += 1
+            old_path.unlink(missing_ok=True)
+
+    async def tee(
+        self, key: str, version: str, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """
+        Отдает чанки дальше и параллельно пишет их на диск. Файл попадает в
+        кэш, только если поток дочитан до конца и уместился в `max_bytes`.
+        """
+        if self.max_bytes <= 0:
+            async for chunk in chunks:
+                yield chunk
+            return
+
+        path = self._path(key, version)
+        tmp_path = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+        file = await asyncio.to_thread(open, tmp_path, "wb")
+        written = 0
+        completed = False
+
+        try:
+            async for chunk in chunks:
+                if not file.closed:
+                    written += len(chunk)
+                    if written > self.max_bytes:
+                        file.close()
+                    else:
+                        await asyncio.to_thread(file.write, chunk)
+
+                yield chunk
+
+            completed = not file.closed
+        finally:
+            file.close()
+
+            if completed:
+                os.replace(tmp_path, path)
+                self._add(key, version, path, written)
+            else:
+                tmp_path.unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "max_size": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -10,10 +10,8 @@ def export_int_fields(
 ) -> frozenset[int]:
     acc = set()
     for dto in dtos:
-        dumped = dto.model_dump()
-
         for field in fields:
-            val: int | None = dumped.get(field, None)
+            val: int | None = getattr(dto, field, None)
             if val:
                 acc.add(val)
 
@@ -28,25 +26,33 @@ def inject_mapping(
     *,
     strict: bool,
 ) -> list[T]:
-    injected_dtos: list[T] = []
+    """
+    Проставляет в DTO значения из `mapping` по полям, содержащим
+    `lookup_pattern`. DTO изменяются на месте, без повторной валидации.
+    """
+    if not dtos:
+        return []
+
+    model_fields = type(dtos[0]).model_fields
+
+    if strict:
+        pairs = [(lookup_pattern, replace_pattern)]
+    else:
+        pairs = [
+            (key, key.replace(lookup_pattern, replace_pattern))
+            for key in model_fields
+            if lookup_pattern in key
+        ]
 
     for dto in dtos:
-        dumped = dto.model_dump()
-
-        if strict:
-            if dumped.get(lookup_pattern, None) is not None:
-                dumped[replace_pattern] = mapping[dumped[lookup_pattern]]
-
-            injected_dtos.append(dto.__class__(**dumped))
-            continue
+        for lookup_key, replace_key in pairs:
+            if replace_key not in model_fields:
+                continue
 
-        dumped_immutable = dto.model_dump()
-        for key in dumped_immutable:
-            if lookup_pattern not in key:
+            value = getattr(dto, lookup_key, None)
+            if strict and value is None:
                 continue
 
-            mapping_key = key.replace(lookup_pattern, replace_pattern)
-            dumped[mapping_key] = mapping[dumped[key]]
-        injected_dtos.append(dto.__class__(**dumped))
+            setattr(dto, replace_key, mapping[value])
 
-    return injected_dtos
+    return list(dtos)
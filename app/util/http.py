@@ -0,0 +1,122 @@
+from typing import AsyncIterator, Callable
+from app.config import Settings
+import httpx
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    def __init__(
+        self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]
+    ):
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+
+class PoolMetricsTransport(httpx.AsyncBaseTransport):
+    """
+    Обертка над транспортом httpx, считающая занятость пула соединений.
+    Запрос считается активным, пока не закрыто тело ответа.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncHTTPTransport, limits: httpx.Limits
+    ):
+        self.transport = transport
+        self.limits = limits
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests_total = 0
+        self.errors_total = 0
+        self.pool_timeouts_total = 0
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        self.requests_total += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.PoolTimeout:
+            self.pool_timeouts_total += 1
+            self.errors_total += 1
+            self._release()
+            raise
+        except BaseException as e:
+            # отмена по дедлайну (CancelledError) тоже должна освобождать слот
+            if isinstance(e, Exception):
+                self.errors_total += 1
+            self._release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TrackedStream(
+                response.stream, self._release  # type: ignore[arg-type]
+            ),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def stats(self) -> dict[str, int | None]:
+        # у httpx нет публичного доступа к пулу httpcore
+        connections = self.transport._pool.connections
+
+        return {
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "requests_total": self.requests_total,
+            "errors_total": self.errors_total,
+            "pool_timeouts_total": self.pool_timeouts_total,
+        }
+
+
+def create_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=Settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        Settings.HTTP_READ_TIMEOUT,
+        connect=Settings.HTTP_CONNECT_TIMEOUT,
+        pool=Settings.HTTP_POOL_TIMEOUT,
+    )
+    transport = PoolMetricsTransport(
+        httpx.AsyncHTTPTransport(limits=limits, http2=Settings.HTTP_HTTP2),
+        limits,
+    )
+
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+
+def get_pool_stats(client: httpx.AsyncClient) -> dict[str, int | None]:
+    transport = client._transport
+    if isinstance(transport, PoolMetricsTransport):
+        return transport.stats()
+
+    return {}
@@ -0,0 +1,91 @@
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import datetime, timezone
+from starlette.datastructures import Headers
+
+
+class RangeNotSatisfiableError(Exception):
+    pass
+
+
+def to_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+
+    return value.astimezone(timezone.utc)
+
+
+def format_http_date(value: datetime) -> str:
+    return format_datetime(to_utc(value), usegmt=True)
+
+
+def parse_byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Разбирает заголовок Range с одним диапазоном байт и возвращает его
+    включительные границы. None означает, что заголовок следует
+    проигнорировать и отдать объект целиком (в т.ч. при нескольких
+    диапазонах).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, separator, last = spec.strip().partition("-")
+    if not separator:
+        return None
+
+    try:
+        if first == "":
+            suffix_length = int(last)
+            if suffix_length <= 0 or size == 0:
+                raise RangeNotSatisfiableError()
+
+            return max(size - suffix_length, 0), size - 1
+
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start > end and last:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiableError()
+
+    return start, min(end, size - 1)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # для If-None-Match используется слабое сравнение
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def is_not_modified(
+    headers: Headers, etag: str, last_modified: datetime
+) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+
+    try:
+        since = to_utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+
+    return to_utc(last_modified).replace(microsecond=0) <= since
+
+
+def is_range_fresh(
+    headers: Headers, etag: str, last_modified: datetime
+) -> bool:
+    """Проверка If-Range: диапазон применяется, только если объект не менялся."""
+    if_range = headers.get("if-range")
+    if if_range is None:
+        return True
+
+    return if_range in (etag, format_http_date(last_modified))
@@ -0,0 +1,14 @@
+from fastapi.responses import JSONResponse
+from typing import Any
+import pydantic_core
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    Сериализует DTO (и списки DTO) сразу в JSON средствами pydantic-core.
+    Если вернуть такой ответ из эндпоинта, FastAPI не станет повторно
+    валидировать данные по `response_model`, а схема в документации останется.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
@@ -0,0 +1,38 @@
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+import asyncio
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Объединяет одновременные вызовы с одинаковым ключом: пока первый вызов
+    выполняется, остальные ждут его результат (или ошибку) вместо того,
+    чтобы повторять запрос.
+    """
+
+    def __init__(self):
+        self._calls: dict[K, asyncio.Future[V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        future = self._calls.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+
+        # отмена одного из ожидающих не должна отменять общий вызов
+        return await asyncio.shield(future)
+
+    def _forget(self, key: K, future: asyncio.Future[V]) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+        # помечаем ошибку прочитанной, даже если все ожидающие отменились
+        if not future.cancelled():
+            future.exception()
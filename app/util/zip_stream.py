@@ -0,0 +1,99 @@
+from typing import AsyncIterator, Callable
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
+from collections import deque
+from datetime import datetime
+import asyncio
+import io
+
+_EOF = object()
+
+
+class _ZipSink(io.RawIOBase):
+    # ZipFile пишет сюда; несмещаемый поток включает data descriptor
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStreamEntry:
+    def __init__(
+        self,
+        name: str,
+        modified_at: datetime,
+        open_stream: Callable[[], AsyncIterator[bytes]],
+    ):
+        self.name = name
+        self.modified_at = modified_at
+        self.open_stream = open_stream
+
+
+async def _pump(entry: ZipStreamEntry, queue: asyncio.Queue) -> None:
+    try:
+        async for chunk in entry.open_stream():
+            await queue.put(chunk)
+    except Exception as e:
+        await queue.put(e)
+    else:
+        await queue.put(_EOF)
+
+
+async def stream_zip(
+    entries: list[ZipStreamEntry],
+    concurrency: int = 4,
+    buffered_chunks: int = 4,
+) -> AsyncIterator[bytes]:
+    """
+    Формирует zip-архив на лету. Одновременно читается не больше
+    `concurrency` файлов, и каждый держит в очереди не больше
+    `buffered_chunks` чанков, поэтому память не зависит от размера архива.
+    Файлы записываются без сжатия: документы и изображения уже сжаты.
+    """
+    pending: deque[tuple[ZipStreamEntry, asyncio.Queue, asyncio.Task]] = deque()
+    upcoming = iter(entries)
+
+    def start_next() -> None:
+        entry = next(upcoming, None)
+        if entry is None:
+            return
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=buffered_chunks)
+        pending.append((entry, queue, asyncio.create_task(_pump(entry, queue))))
+
+    for _ in range(concurrency):
+        start_next()
+
+    sink = _ZipSink()
+    try:
+        with ZipFile(sink, mode="w", compression=ZIP_STORED) as archive:
+            while pending:
+                entry, queue, _ = pending[0]
+
+                info = ZipInfo(entry.name, entry.modified_at.timetuple()[:6])
+                info.external_attr = 0o644 << 16
+
+                with archive.open(info, mode="w", force_zip64=True) as file:
+                    while (chunk := await queue.get()) is not _EOF:
+                        if isinstance(chunk, Exception):
+                            raise chunk
+
+                        file.write(chunk)
+                        yield sink.drain()
+
+                pending.popleft()
+                start_next()
+
+        yield sink.drain()
+    finally:
+        for _, _, task in pending:
+            task.cancel()
@@ -0,0 +1,21 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_hackathon_t_hackathon_id" ON "hackathon_teams" ("hackathon_id");
+        CREATE INDEX IF NOT EXISTS "idx_hackathonte_user_id" ON "hackathonteammatesmodel" ("user_id");
+        CREATE INDEX IF NOT EXISTS "idx_hackathonte_team_id_captain" ON "hackathonteammatesmodel" ("team_id") WHERE "is_captain" = TRUE;
+        CREATE INDEX IF NOT EXISTS "idx_teammatesmo_team_id" ON "teammatesmodel" ("team_id");
+        CREATE INDEX IF NOT EXISTS "idx_teammatesmo_team_id_captain" ON "teammatesmodel" ("team_id") WHERE "is_captain" = TRUE;
+        CREATE INDEX IF NOT EXISTS "idx_teaminvites_user_id" ON "teaminvitesmodel" ("user_id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_teaminvites_user_id";
+        DROP INDEX IF EXISTS "idx_teammatesmo_team_id_captain";
+        DROP INDEX IF EXISTS "idx_teammatesmo_team_id";
+        DROP INDEX IF EXISTS "idx_hackathonte_team_id_captain";
+        DROP INDEX IF EXISTS "idx_hackathonte_user_id";
+        DROP INDEX IF EXISTS "idx_hackathon_t_hackathon_id";"""
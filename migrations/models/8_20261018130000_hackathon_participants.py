@@ -0,0 +1,21 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "hackathon_participants" (
+    "hackathon_id" INT NOT NULL PRIMARY KEY,
+    "registered_count" INT NOT NULL DEFAULT 0
+);
+        INSERT INTO "hackathon_participants" ("hackathon_id", "registered_count")
+            SELECT t."hackathon_id", COUNT(m."id")
+            FROM "hackathon_teams" t
+            JOIN "hackathonteammatesmodel" m ON m."team_id" = t."id"
+            GROUP BY t."hackathon_id"
+        ON CONFLICT ("hackathon_id") DO UPDATE
+            SET "registered_count" = EXCLUDED."registered_count";"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "hackathon_participants";"""
@@ -0,0 +1,20 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "outbox_events" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "event_id" UUID NOT NULL,
+    "event_name" VARCHAR(255) NOT NULL,
+    "data" JSONB NOT NULL,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "sent_at" TIMESTAMPTZ
+);
+        CREATE INDEX IF NOT EXISTS "idx_outbox_even_unsent" ON "outbox_events" ("id") WHERE "sent_at" IS NULL;
+        CREATE INDEX IF NOT EXISTS "idx_outbox_even_sent_at" ON "outbox_events" ("sent_at") WHERE "sent_at" IS NOT NULL;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "outbox_events";"""
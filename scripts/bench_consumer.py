@@ -0,0 +1,141 @@
+"""
+Измеряет пропускную способность AioPikaEventConsumerAdapter и проверяет
+порядок событий одной сущности.
+
+    python -m scripts.bench_consumer [--messages 5000] [--workers 1 8 32]
+
+Вместо RabbitMQ используется очередь в памяти, которая, как брокер с
+basic.qos, выдает не больше `--prefetch` неподтвержденных сообщений.
+События user.deleted/user.banned проходят через register_events и
+dispatch_batch к подписчику, который спит `--latency-ms` на каждый вызов.
+"""
+
+from app.adapters.event_consumer.aiopika import AioPikaEventConsumerAdapter
+from app.events.emitter import Emitter, Events
+from app.events import register_events
+import argparse
+import asyncio
+import random
+import time
+import json
+
+
+class _Message:
+    def __init__(self, broker: "_Broker", body: bytes):
+        self.broker = broker
+        self.body = body
+
+    async def ack(self) -> None:
+        self.broker.settle()
+
+    async def nack(self, requeue: bool = True) -> None:
+        self.broker.settle()
+        self.broker.nacked += 1
+
+
+class _Broker:
+    """
+    Очередь сообщений с ограничением на число неподтвержденных, заменяющая
+    aio_pika.Queue в адаптере.
+    """
+
+    def __init__(self, bodies: list[bytes], prefetch: int):
+        self.messages = [_Message(self, body) for body in bodies]
+        self.unacked = 0
+        self.peak_unacked = 0
+        self.settled = 0
+        self.nacked = 0
+        self.done = asyncio.Event()
+        self._slots = asyncio.Semaphore(prefetch)
+
+    def settle(self) -> None:
+        self._slots.release()
+        self.unacked -= 1
+        self.settled += 1
+        if self.settled == len(self.messages):
+            self.done.set()
+
+    async def bind(self, *args, **kwargs) -> None:
+        pass
+
+    def iterator(self) -> "_Broker":
+        return self
+
+    async def __aenter__(self) -> "_Broker":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        pass
+
+    async def __aiter__(self):
+        for message in self.messages:
+            await self._slots.acquire()
+            self.unacked += 1
+            self.peak_unacked = max(self.peak_unacked, self.unacked)
+            yield message
+
+        await asyncio.Event().wait()
+
+
+def _make_bodies(count: int, entities: int) -> list[bytes]:
+    return [
+        json.dumps(
+            {
+                "event_name": random.choice(
+                    (Events.UserDeleted, Events.UserBanned)
+                ),
+                "data": {"id": i % entities, "seq": i, "is_banned": True},
+            }
+        ).encode()
+        for i in range(count)
+    ]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--entities", type=int, default=50)
+    parser.add_argument("--prefetch", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    seen: dict[int, list[int]] = {}
+
+    async def listener(payload: dict) -> None:
+        await asyncio.sleep(args.latency_ms / 1000)
+        data = payload["data"]
+        seen.setdefault(data["id"], []).append(data["seq"])
+
+    Emitter.on(Events.UserDeleted, listener)
+    Emitter.on(Events.UserBanned, listener)
+
+    bodies = _make_bodies(args.messages, args.entities)
+    for workers in args.workers:
+        seen.clear()
+        broker = _Broker(bodies, args.prefetch)
+        consumer = AioPikaEventConsumerAdapter(
+            "amqp://",
+            prefetch_count=args.prefetch,
+            workers=workers,
+            batch_size=args.batch_size,
+        )
+        consumer._queue = broker  # type: ignore[assignment]
+
+        started = time.perf_counter()
+        task = await register_events(consumer)
+        await broker.done.wait()
+        elapsed = time.perf_counter() - started
+        task.cancel()
+
+        ordered = all(seqs == sorted(seqs) for seqs in seen.values())
+        print(
+            f"workers {workers:>3}  {args.messages / elapsed:8.0f} msg/s"
+            f"  ordered {ordered}  peak unacked {broker.peak_unacked}"
+            f"  nacked {broker.nacked}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+"""
+Сравнивает dto_utils.export_int_fields/inject_mapping с прежней реализацией,
+которая делала model_dump каждого DTO и пересоздавала его с валидацией.
+
+    python -m scripts.bench_dto [--sizes 10 100 10000]
+
+Для каждого размера печатает время одного прохода export + inject над
+TeamMateDto в обоих режимах (strict и нет) и ускорение относительно старой
+реализации. Перед замером проверяется, что результаты совпадают.
+"""
+
+from app.services.mate.dto import TeamMateDto
+from app.util import dto_utils
+from collections import defaultdict
+from pydantic import BaseModel
+from typing import Callable, Sequence, TypeVar
+import argparse
+import time
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def _legacy_export_int_fields(
+    dtos: Sequence[BaseModel], *fields: str
+) -> frozenset[int]:
+    acc = set()
+    for dto in dtos:
+        dumped = dto.model_dump()
+
+        for field in fields:
+            val: int | None = dumped.get(field, None)
+            if val:
+                acc.add(val)
+
+    return frozenset(acc)
+
+
+def _legacy_inject_mapping(
+    dtos: Sequence[T],
+    mapping: defaultdict[int, str | None],
+    lookup_pattern: str,
+    replace_pattern: str,
+    *,
+    strict: bool,
+) -> list[T]:
+    injected_dtos: list[T] = []
+
+    for dto in dtos:
+        dumped = dto.model_dump()
+
+        if strict:
+            if dumped.get(lookup_pattern, None) is not None:
+                dumped[replace_pattern] = mapping[dumped[lookup_pattern]]
+
+            injected_dtos.append(dto.__class__(**dumped))
+            continue
+
+        dumped_immutable = dto.model_dump()
+        for key in dumped_immutable:
+            if lookup_pattern not in key:
+                continue
+
+            mapping_key = key.replace(lookup_pattern, replace_pattern)
+            dumped[mapping_key] = mapping[dumped[key]]
+        injected_dtos.append(dto.__class__(**dumped))
+
+    return injected_dtos
+
+
+def _make_dtos(count: int) -> list[TeamMateDto]:
+    return [
+        TeamMateDto(
+            team_id=i // 5, user_id=i, is_captain=i % 5 == 0, role_desc=None
+        )
+        for i in range(count)
+    ]
+
+
+def _enrich(
+    export: Callable, inject: Callable, dtos: list[TeamMateDto], strict: bool
+) -> list[TeamMateDto]:
+    names = defaultdict(
+        lambda: None, {i: f"user {i}" for i in export(dtos, "user_id")}
+    )
+    return inject(dtos, names, "user_id", "user_name", strict=strict)
+
+
+def _measure(
+    export: Callable, inject: Callable, count: int, strict: bool
+) -> float:
+    # DTO создаются заново на каждый проход, как в сервисах, но вне замера
+    number = max(3, 100_000 // count)
+    batches = [_make_dtos(count) for _ in range(number)]
+
+    started = time.perf_counter()
+    for dtos in batches:
+        _enrich(export, inject, dtos, strict)
+
+    return (time.perf_counter() - started) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 10_000]
+    )
+    args = parser.parse_args()
+
+    for strict in (True, False):
+        for count in args.sizes:
+            legacy = (_legacy_export_int_fields, _legacy_inject_mapping)
+            current = (dto_utils.export_int_fields, dto_utils.inject_mapping)
+
+            assert _enrich(*legacy, _make_dtos(count), strict) == _enrich(
+                *current, _make_dtos(count), strict
+            )
+
+            legacy_time = _measure(*legacy, count, strict)
+            current_time = _measure(*current, count, strict)
+
+            print(
+                f"strict={strict!s:<5} {count:>6} dto"
+                f"  legacy {legacy_time * 1e6:10.1f} us"
+                f"  current {current_time * 1e6:10.1f} us"
+                f"  x{legacy_time / current_time:5.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Измеряет время и пиковую память потоковой выгрузки zip (stream_zip).
+
+    python -m scripts.bench_export [--files 300] [--size-mb 4]
+
+Источником служат синтетические потоки: каждый файл отдается чанками по
+64 KiB (как S3StorageAdapter.iter_body) с задержкой `--latency-ms` на чанк,
+имитирующей сеть. Архив никуда не сохраняется, считается только его размер.
+Пиковая память (tracemalloc) не должна расти с числом и размером файлов.
+"""
+
+from app.util.zip_stream import ZipStreamEntry, stream_zip
+from datetime import datetime, timezone
+from typing import AsyncIterator
+import tracemalloc
+import argparse
+import asyncio
+import time
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def _source(size: int, latency: float) -> AsyncIterator[bytes]:
+    chunk = bytes(CHUNK_SIZE)
+    sent = 0
+    while sent < size:
+        await asyncio.sleep(latency)
+        part = chunk[: min(CHUNK_SIZE, size - sent)]
+        sent += len(part)
+        yield part
+
+
+async def _run(files: int, size: int, concurrency: int, latency: float) -> None:
+    now = datetime.now(timezone.utc)
+    entries = [
+        ZipStreamEntry(
+            f"team_{i}/submission_{i}.pdf",
+            now,
+            lambda: _source(size, latency),
+        )
+        for i in range(files)
+    ]
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    archive_size = 0
+    async for data in stream_zip(entries, concurrency):
+        archive_size += len(data)
+
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"concurrency {concurrency:>3}  {archive_size / 2**20:9.1f} MB"
+        f"  {elapsed:6.2f} s  {archive_size / elapsed / 2**20:8.1f} MB/s"
+        f"  peak {peak / 2**20:6.1f} MB"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--size-mb", type=float, default=4)
+    parser.add_argument("--latency-ms", type=float, default=1)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4, 16]
+    )
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 2**20)
+    for concurrency in args.concurrency:
+        await _run(args.files, size, concurrency, args.latency_ms / 1000)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,219 @@
+"""
+Сравнивает число запросов к БД и время get_hackathon_teams и
+get_hackathon_teams_many с прежней реализацией, которая загружала решение
+каждой команды отдельным запросом.
+
+    python -m scripts.bench_hackathon_teams [--teams 5000] [--db-url ...]
+
+По умолчанию используется sqlite в памяти; для замера на postgres передайте
+`--db-url` пустой базы (схема создается скриптом). Половине команд
+загружается решение. Перед замером проверяется, что результаты совпадают.
+"""
+
+from app.services.hackathon_teams.service import HackathonTeamsService
+from app.services.hackathon_teams.dto import HackathonTeamDto
+from app.ports.hackathonservice import IHackathonServicePort
+from app.ports.hackathonservice.dto import HackathonDto
+from datetime import datetime, timedelta, timezone
+from app.util.disk_cache import DiskLRUCache
+from typing import Awaitable, Callable
+from tortoise import Tortoise
+import tempfile
+import argparse
+import asyncio
+import time
+
+from app.models.hackathon_team import (
+    HackathonTeamSubmissionModel,
+    HackathonTeamModel,
+)
+from app.services.hackathon_team_submissions.service import (
+    HackathonTeamSubmissionsService,
+)
+
+HACKATHON_ID = 1
+
+
+class _Hackathons(IHackathonServicePort):
+    async def get_hackathon_data(self, hackathon_id: int) -> HackathonDto:
+        start_date = datetime.now(timezone.utc) + timedelta(days=1)
+        return HackathonDto(
+            id=hackathon_id,
+            name=f"Hackathon {hackathon_id}",
+            max_participant_count=100_000,
+            max_team_mates_count=5,
+            start_date=start_date,
+            score_start_date=start_date + timedelta(days=1),
+            end_date=start_date + timedelta(days=2),
+        )
+
+    async def can_edit_team_registry(self, hackathon_id: int) -> bool:
+        return True
+
+    async def can_upload_submissions(self, hackathon_id: int) -> bool:
+        return False
+
+
+class _QueryCounter:
+    """
+    Считает запросы, прошедшие через соединение по умолчанию.
+    """
+
+    def __init__(self):
+        self.count = 0
+        client = Tortoise.get_connection("default")
+
+        for name in ("execute_query", "execute_query_dict"):
+            method = getattr(client, name)
+            setattr(client, name, self._wrap(method))
+
+    def _wrap(self, method):
+        async def wrapper(*args, **kwargs):
+            self.count += 1
+            return await method(*args, **kwargs)
+
+        return wrapper
+
+
+def _build_service() -> HackathonTeamsService:
+    # для листингов нужны только хакатоны и решения
+    hackathons = _Hackathons()
+    return HackathonTeamsService(
+        hackathon_service=hackathons,
+        brand_mate_service=None,  # type: ignore[arg-type]
+        brand_team_service=None,  # type: ignore[arg-type]
+        submission_service=HackathonTeamSubmissionsService(
+            hackathons,
+            storage=None,  # type: ignore[arg-type]
+            file_cache=DiskLRUCache(tempfile.mkdtemp(), 0),
+        ),
+        user_service=None,  # type: ignore[arg-type]
+    )
+
+
+async def _legacy_get_hackathon_teams(
+    service: HackathonTeamsService, hackathon_id: int
+) -> list[HackathonTeamDto]:
+    teams = await HackathonTeamModel.filter(hackathon_id=hackathon_id)
+    hackathon_data = await service.hackathon_service.try_get_hackathon_data(
+        hackathon_id
+    )
+    hackathon_name = hackathon_data.name if hackathon_data else None
+
+    return [
+        HackathonTeamDto.from_tortoise(
+            team,
+            hackathon_name,
+            await service.submission_service.get_submission(
+                team.hackathon_id, team.id
+            ),
+        )
+        for team in teams
+    ]
+
+
+async def _legacy_get_hackathon_teams_many(
+    service: HackathonTeamsService, hackathon_team_ids: list[int]
+) -> list[HackathonTeamDto]:
+    teams = await HackathonTeamModel.filter(id__in=hackathon_team_ids)
+    return [
+        HackathonTeamDto.from_tortoise(
+            team,
+            None,
+            await service.submission_service.get_submission(
+                team.hackathon_id, team.id
+            ),
+        )
+        for team in teams
+    ]
+
+
+async def _seed(teams: int) -> list[int]:
+    await HackathonTeamModel.bulk_create(
+        [
+            HackathonTeamModel(hackathon_id=HACKATHON_ID, name=f"Team {i}")
+            for i in range(teams)
+        ],
+        batch_size=1000,
+    )
+    team_ids = await HackathonTeamModel.filter(
+        hackathon_id=HACKATHON_ID
+    ).values_list("id", flat=True)
+
+    await HackathonTeamSubmissionModel.bulk_create(
+        [
+            HackathonTeamSubmissionModel(
+                team_id=team_id,
+                hackathon_id=HACKATHON_ID,
+                name="solution.pdf",
+                s3_key=f"team_submissions/{HACKATHON_ID}/{team_id}/solution",
+                content_type="application/pdf",
+            )
+            for team_id in team_ids[::2]
+        ],
+        batch_size=1000,
+    )
+    return list(team_ids)
+
+
+async def _measure(
+    name: str,
+    counter: _QueryCounter,
+    fn: Callable[[], Awaitable[list[HackathonTeamDto]]],
+) -> list[HackathonTeamDto]:
+    queries = counter.count
+    started = time.perf_counter()
+    result = await fn()
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:<32} {counter.count - queries:>6} queries"
+        f"  {elapsed * 1000:9.1f} ms"
+    )
+    return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, default=5000)
+    parser.add_argument("--db-url", default="sqlite://:memory:")
+    args = parser.parse_args()
+
+    await Tortoise.init(db_url=args.db_url, modules={"models": ["app.models"]})
+    await Tortoise.generate_schemas()
+
+    service = _build_service()
+
+    try:
+        team_ids = await _seed(args.teams)
+        counter = _QueryCounter()
+
+        legacy = await _measure(
+            "legacy get_hackathon_teams",
+            counter,
+            lambda: _legacy_get_hackathon_teams(service, HACKATHON_ID),
+        )
+        current = await _measure(
+            "get_hackathon_teams",
+            counter,
+            lambda: service.get_hackathon_teams(HACKATHON_ID),
+        )
+        assert legacy == current
+
+        legacy = await _measure(
+            "legacy get_hackathon_teams_many",
+            counter,
+            lambda: _legacy_get_hackathon_teams_many(service, team_ids),
+        )
+        current = await _measure(
+            "get_hackathon_teams_many",
+            counter,
+            lambda: service.get_hackathon_teams_many(team_ids),
+        )
+        assert legacy == current
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Сравнивает способы сериализации большого листинга get_hackathon_teams:
+через `response_model` (повторная валидация и dump), через
+jsonable_encoder (внутренние роуты без response_model) и через
+PydanticJSONResponse.
+
+    python -m scripts.bench_listing [--teams 10000] [--repeat 5]
+
+Листинг строится сервисом по sqlite в памяти, половина команд с решениями.
+Печатается лучшее время из `--repeat` прогонов каждого способа; перед
+замером проверяется, что все способы дают одинаковый JSON.
+"""
+
+from scripts.bench_hackathon_teams import HACKATHON_ID, _build_service, _seed
+from app.services.hackathon_teams.dto import HackathonTeamDto
+from fastapi.routing import serialize_response
+from fastapi.encoders import jsonable_encoder
+from app.util.responses import PydanticJSONResponse
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_model_field
+from typing import Awaitable, Callable
+from tortoise import Tortoise
+import argparse
+import asyncio
+import time
+import json
+
+
+async def _response_model(dtos: list[HackathonTeamDto]) -> bytes:
+    field = create_model_field(
+        name="Response", type_=list[HackathonTeamDto], mode="serialization"
+    )
+    content = await serialize_response(field=field, response_content=dtos)
+    return JSONResponse(content).body
+
+
+async def _jsonable_encoder(dtos: list[HackathonTeamDto]) -> bytes:
+    return JSONResponse(jsonable_encoder(dtos)).body
+
+
+async def _pydantic_json(dtos: list[HackathonTeamDto]) -> bytes:
+    return PydanticJSONResponse(dtos).body
+
+
+async def _measure(
+    fn: Callable[[list[HackathonTeamDto]], Awaitable[bytes]],
+    dtos: list[HackathonTeamDto],
+    repeat: int,
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn(dtos)
+        best = min(best, time.perf_counter() - started)
+
+    return best
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    await Tortoise.init(
+        db_url="sqlite://:memory:", modules={"models": ["app.models"]}
+    )
+    await Tortoise.generate_schemas()
+
+    try:
+        await _seed(args.teams)
+        dtos = await _build_service().get_hackathon_teams(HACKATHON_ID)
+    finally:
+        await Tortoise.close_connections()
+
+    paths = {
+        "response_model": _response_model,
+        "jsonable_encoder": _jsonable_encoder,
+        "PydanticJSONResponse": _pydantic_json,
+    }
+
+    bodies = [json.loads(await fn(dtos)) for fn in paths.values()]
+    assert all(body == bodies[0] for body in bodies)
+
+    print(f"{len(dtos)} HackathonTeamDto")
+    for name, fn in paths.items():
+        elapsed = await _measure(fn, dtos, args.repeat)
+        print(f"{name:<22} {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
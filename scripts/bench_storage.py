@@ -0,0 +1,106 @@
+"""
+Измеряет пропускную способность S3StorageAdapter и задержку event loop.
+
+    python -m scripts.bench_storage [--objects 32] [--size-mb 4]
+
+Скрипт параллельно загружает в бакет (S3_ENDPOINT) `--objects` объектов
+размером `--size-mb`, затем скачивает их через get_object/iter_body и удаляет.
+Для каждой фазы печатает MB/s и максимальную задержку event loop: если
+адаптер где-то блокирует loop, она вырастет до длительности запроса.
+"""
+
+from app.adapters.storage import S3StorageAdapter
+from typing import Awaitable, Callable
+from uuid import uuid4
+import argparse
+import asyncio
+import time
+import os
+import io
+
+
+class _LoopLagProbe:
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - started - self.interval
+            self.max_lag = max(self.max_lag, lag)
+
+    def __enter__(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+
+async def _phase(
+    name: str,
+    keys: list[str],
+    total_bytes: int,
+    concurrency: int,
+    fn: Callable[[str], Awaitable[None]],
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(key: str) -> None:
+        async with semaphore:
+            await fn(key)
+
+    with _LoopLagProbe() as probe:
+        started = time.perf_counter()
+        await asyncio.gather(*(run(key) for key in keys))
+        elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:<8} {total_bytes / elapsed / 2**20:8.1f} MB/s"
+        f"  {elapsed:6.2f} s  max loop lag {probe.max_lag * 1000:6.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bucket", default="hackathons")
+    parser.add_argument("--objects", type=int, default=32)
+    parser.add_argument("--size-mb", type=float, default=4)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    storage = S3StorageAdapter()
+    await storage.ensure_bucket(args.bucket)
+
+    payload = os.urandom(int(args.size_mb * 2**20))
+    prefix = f"bench/{uuid4().hex}"
+    keys = [f"{prefix}/{i}" for i in range(args.objects)]
+    total_bytes = len(payload) * len(keys)
+
+    async def upload(key: str) -> None:
+        await storage.upload_file(
+            io.BytesIO(payload), args.bucket, key, "application/octet-stream"
+        )
+
+    async def download(key: str) -> None:
+        s3_obj = await storage.get_object(args.bucket, key)
+        async for _ in storage.iter_body(s3_obj["Body"]):
+            pass
+
+    async def delete(key: str) -> None:
+        await storage.delete_object(args.bucket, key)
+
+    try:
+        await _phase("upload", keys, total_bytes, args.concurrency, upload)
+        await _phase("download", keys, total_bytes, args.concurrency, download)
+    finally:
+        await asyncio.gather(*(delete(key) for key in keys))
+        storage.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,186 @@
+"""
+Проверяет через EXPLAIN, что горячие запросы сервисов используют индексы.
+
+    python -m scripts.check_indexes [--teams 20000]
+
+Скрипт наполняет базу (DATABASE_URL) тестовыми данными внутри транзакции,
+выполняет ANALYZE и EXPLAIN для каждого запроса, после чего транзакция
+откатывается. Возвращает ненулевой код, если хотя бы один запрос читает
+таблицу последовательным сканированием.
+"""
+
+from tortoise.transactions import in_transaction
+from typing import Any, Callable
+from app.db import TORTOISE_ORM
+from tortoise import Tortoise
+import argparse
+import asyncio
+import json
+import sys
+
+from app.models import (
+    HackathonTeamSubmissionModel,
+    HackathonTeamMatesModel,
+    HackathonTeamModel,
+    TeamInvitesModel,
+    TeamMatesModel,
+)
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+
+SEED_SQL = """
+    INSERT INTO "hackathon_teams" ("hackathon_id", "name")
+        SELECT g % {hackathons}, 'seed_' || g FROM generate_series(1, {teams}) g;
+    INSERT INTO "hackathonteammatesmodel" ("team_id", "user_id", "is_captain")
+        SELECT t."id", t."id" * 3 + k, k = 0
+        FROM "hackathon_teams" t CROSS JOIN generate_series(0, 2) k
+        WHERE t."name" LIKE 'seed\\_%';
+    INSERT INTO "team_submissions"
+        ("team_id", "hackathon_id", "name", "s3_key", "content_type")
+        SELECT t."id", t."hackathon_id", 'seed.pptx', 'seed', 'seed'
+        FROM "hackathon_teams" t
+        WHERE t."name" LIKE 'seed\\_%' AND t."id" % 2 = 0;
+    INSERT INTO "teams" ("name")
+        SELECT 'seed_' || g FROM generate_series(1, {teams}) g;
+    INSERT INTO "teammatesmodel" ("team_id", "user_id", "is_captain")
+        SELECT t."id", -(t."id" * 3 + k), k = 0
+        FROM "teams" t CROSS JOIN generate_series(0, 2) k
+        WHERE t."name" LIKE 'seed\\_%';
+    INSERT INTO "teaminvitesmodel" ("team_id", "user_id")
+        SELECT t."id", t."id" % 5000
+        FROM "teams" t
+        WHERE t."name" LIKE 'seed\\_%';
+    ANALYZE;
+"""
+
+# (место в коде, таблица, которая должна читаться по индексу, запрос)
+HOT_QUERIES: list[tuple[str, str, Callable[[], Any]]] = [
+    (
+        "HackathonTeamsService.mate_exists",
+        "hackathonteammatesmodel",
+        lambda: HackathonTeamMatesModel.exists(
+            user_id=42, team__hackathon_id=7
+        ),
+    ),
+    (
+        "HackathonTeamsService.any_mate_exists",
+        "hackathonteammatesmodel",
+        lambda: HackathonTeamMatesModel.exists(
+            user_id__in=[42, 43, 44], team__hackathon_id=7
+        ),
+    ),
+    (
+        "HackathonTeamsService.get_hackathon_teams",
+        "hackathon_teams",
+        lambda: HackathonTeamModel.filter(hackathon_id=7),
+    ),
+    (
+        "HackathonTeamsService.get_mates",
+        "hackathonteammatesmodel",
+        lambda: HackathonTeamMatesModel.filter(team_id=42),
+    ),
+    (
+        "HackathonTeamsService.get_captains",
+        "hackathonteammatesmodel",
+        lambda: HackathonTeamMatesModel.filter(team_id=42, is_captain=True),
+    ),
+    (
+        "HackathonTeamsService.on_user_deleted",
+        "hackathonteammatesmodel",
+        lambda: HackathonTeamMatesModel.filter(user_id=42),
+    ),
+    (
+        "HackathonTeamSubmissionsService.get_submission",
+        "team_submissions",
+        lambda: HackathonTeamSubmissionModel.filter(hackathon_id=7, team_id=42),
+    ),
+    (
+        "HackathonTeamSubmissionsService.get_submissions_many",
+        "team_submissions",
+        lambda: HackathonTeamSubmissionModel.filter(
+            team_id__in=[42, 44, 46], hackathon_id=7
+        ),
+    ),
+    (
+        "MateService.get_mates",
+        "teammatesmodel",
+        lambda: TeamMatesModel.filter(team_id=42),
+    ),
+    (
+        "MateService.get_captains",
+        "teammatesmodel",
+        lambda: TeamMatesModel.filter(team_id=42, is_captain=True),
+    ),
+    (
+        "InviteService.get_user_invites",
+        "teaminvitesmodel",
+        lambda: TeamInvitesModel.filter(user_id=42),
+    ),
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _walk(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def _uses_index(plan: dict, relation: str) -> bool:
+    nodes = [
+        node for node in _walk(plan) if node.get("Relation Name") == relation
+    ]
+    return bool(nodes) and all(
+        node["Node Type"] in INDEX_NODES for node in nodes
+    )
+
+
+async def check(teams: int) -> bool:
+    ok = True
+
+    try:
+        async with in_transaction() as connection:
+            await connection.execute_script(
+                SEED_SQL.format(teams=teams, hackathons=max(teams // 20, 1))
+            )
+
+            for name, relation, build_query in HOT_QUERIES:
+                sql = build_query().sql(params_inline=True)
+                _, rows = await connection.execute_query(
+                    f"EXPLAIN (FORMAT JSON) {sql}"
+                )
+                plan = rows[0]["QUERY PLAN"]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+
+                uses_index = _uses_index(plan[0]["Plan"], relation)
+                ok = ok and uses_index
+                print(f"[{'OK' if uses_index else 'FAIL'}] {name} ({relation})")
+
+                if not uses_index:
+                    print(json.dumps(plan, indent=2, ensure_ascii=False))
+
+            raise _Rollback()
+    except _Rollback:
+        pass
+
+    return ok
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, default=20_000)
+    args = parser.parse_args()
+
+    await Tortoise.init(config=TORTOISE_ORM)
+    try:
+        return 0 if await check(args.teams) else 1
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
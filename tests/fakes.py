@@ -0,0 +1,69 @@
+from app.ports.hackathonservice import IHackathonServicePort
+from app.ports.hackathonservice.dto import HackathonDto
+from app.ports.userservice.dto import ExternalUserDto
+from app.ports.userservice import IUserServicePort
+from datetime import datetime, timedelta, timezone
+from app.acl.roles import UserRoles
+
+
+class FakeUserService(IUserServicePort):
+    """
+    Отдает пользователей с предсказуемыми именами и запоминает каждый вызов
+    в `calls`, чтобы тесты могли проверить число обращений к сервису.
+    """
+
+    base_url = "http://userservice/"
+
+    def __init__(self):
+        self.calls: list[tuple[str, int | frozenset[int]]] = []
+
+    async def get_user_info(self, user_id: int) -> ExternalUserDto:
+        self.calls.append(("get_user_info", user_id))
+        return self._user(user_id)
+
+    async def get_user_info_many(
+        self, user_ids: frozenset[int]
+    ) -> list[ExternalUserDto]:
+        self.calls.append(("get_user_info_many", frozenset(user_ids)))
+        return [self._user(user_id) for user_id in user_ids]
+
+    def _user(self, user_id: int) -> ExternalUserDto:
+        return ExternalUserDto(
+            id=user_id,
+            is_banned=False,
+            formatted_name=f"User {user_id}",
+            role=UserRoles.User,
+        )
+
+
+class FakeHackathonService(IHackathonServicePort):
+    """
+    Хакатон, регистрация в который открыта, пока не наступил `start_date`.
+    Каждый вызов запоминается в `calls`.
+    """
+
+    def __init__(self, max_participant_count=100, max_team_mates_count=5):
+        self.max_participant_count = max_participant_count
+        self.max_team_mates_count = max_team_mates_count
+        self.start_date = datetime.now(timezone.utc) + timedelta(days=1)
+        self.calls: list[tuple[str, int]] = []
+
+    async def get_hackathon_data(self, hackathon_id: int) -> HackathonDto:
+        self.calls.append(("get_hackathon_data", hackathon_id))
+        return HackathonDto(
+            id=hackathon_id,
+            name=f"Hackathon {hackathon_id}",
+            max_participant_count=self.max_participant_count,
+            max_team_mates_count=self.max_team_mates_count,
+            start_date=self.start_date,
+            score_start_date=self.start_date + timedelta(days=1),
+            end_date=self.start_date + timedelta(days=2),
+        )
+
+    async def can_edit_team_registry(self, hackathon_id: int) -> bool:
+        self.calls.append(("can_edit_team_registry", hackathon_id))
+        return datetime.now(timezone.utc) < self.start_date
+
+    async def can_upload_submissions(self, hackathon_id: int) -> bool:
+        self.calls.append(("can_upload_submissions", hackathon_id))
+        return datetime.now(timezone.utc) >= self.start_date
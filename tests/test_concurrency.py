@@ -0,0 +1,78 @@
+from app.util.concurrency import DeadlineExceededException, gather
+from app.util import concurrency
+from fastapi import HTTPException
+import asyncio
+import pytest
+import time
+
+pytestmark = pytest.mark.anyio
+
+
+async def _value(value: int, delay: float = 0.0) -> int:
+    await asyncio.sleep(delay)
+    return value
+
+
+async def _fail(status_code: int) -> None:
+    raise HTTPException(status_code=status_code)
+
+
+async def test_results_keep_argument_order():
+    result = await gather(_value(1, 0.02), _value(2), _value(3, 0.01))
+    assert result == (1, 2, 3)
+
+
+async def test_first_leaf_exception_is_raised():
+    # ошибка вложенного gather приходит наружу без ExceptionGroup
+    with pytest.raises(HTTPException) as e:
+        await gather(_value(1, 0.01), gather(_fail(404), _value(2, 1.0)))
+
+    assert e.value.status_code == 404
+
+
+async def test_siblings_are_cancelled():
+    cancelled = asyncio.Event()
+
+    async def sibling() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(HTTPException):
+        await gather(sibling(), _fail(400))
+
+    assert cancelled.is_set()
+
+
+async def test_deadline_raises_504():
+    with pytest.raises(DeadlineExceededException) as e:
+        await gather(_value(1), _value(2, 10), deadline=0.05)
+
+    assert e.value.status_code == 504
+    assert concurrency._deadline_at.get() is None
+
+
+async def test_nested_gather_cannot_extend_outer_deadline():
+    seen: list[float | None] = []
+
+    async def nested() -> tuple[int, int]:
+        outer = concurrency._deadline_at.get()
+        try:
+            return await gather(_value(1), inner(), deadline=60)
+        finally:
+            seen.append(outer)
+
+    async def inner() -> int:
+        seen.append(concurrency._deadline_at.get())
+        return await _value(2, 10)
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceededException):
+        await gather(_value(0), nested(), deadline=0.05)
+
+    assert time.perf_counter() - started < 1
+    # вложенный вызов унаследовал срок внешнего, а не отсчитал свои 60 с
+    assert seen[0] is not None
+    assert seen[0] == seen[1]
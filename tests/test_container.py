@@ -0,0 +1,99 @@
+from app.services.hackathon_teams.service import HackathonTeamsService
+from app.events.emitter import BatchHandlers, Emitter, Events
+from tests.fakes import FakeHackathonService, FakeUserService
+from app.container import Container
+from app.events import dispatch_batch
+from app.config import Settings
+from app.main import app
+import tracemalloc
+import httpx
+import pytest
+import json
+import gc
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("db")]
+
+HACKATHON_ID = 7
+REQUESTS = 300
+
+
+def _upstream_client(service) -> httpx.AsyncClient:
+    users = FakeUserService()
+    hackathons = FakeHackathonService()
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if service == "user":
+            user_ids = json.loads(request.content)
+            data = [users._user(user_id).model_dump() for user_id in user_ids]
+        else:
+            hackathon = await hackathons.get_hackathon_data(HACKATHON_ID)
+            data = hackathon.model_dump(mode="json")
+
+        return httpx.Response(200, json=data)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+
+def _handler_counts() -> dict[str, tuple[int, int]]:
+    return {
+        event: (len(Emitter.listeners(event)), len(BatchHandlers[event]))
+        for event in Events
+    }
+
+
+async def test_sustained_load_keeps_handlers_and_memory_flat(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(Settings, "SUBMISSION_CACHE_DIR", str(tmp_path))
+    container = Container(_upstream_client("user"), _upstream_client("hack"))
+    container.init_events()
+    app.state.container = container
+
+    service: HackathonTeamsService = container.hackathon_teams_service
+    team = await container.team_service.create("Team", 1)
+    await service.create(team.id, HACKATHON_ID, [1])
+
+    headers = {"Authorization": f"Bearer {Settings.INTERNAL_API_KEY}"}
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+    async def load(count: int) -> None:
+        for i in range(count):
+            for url in (
+                f"/internal/{team.id}",
+                f"/internal/hackathon/{HACKATHON_ID}/teams",
+            ):
+                response = await client.get(url, headers=headers)
+                assert response.status_code == 200
+
+            # пользователь не забанен, так что команды не меняются
+            await dispatch_batch(
+                [
+                    {
+                        "event_name": Events.UserBanned,
+                        "data": {"id": 1000 + i, "is_banned": False},
+                    }
+                ]
+            )
+
+    try:
+        handlers = _handler_counts()
+        await load(REQUESTS // 10)
+
+        gc.collect()
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        await load(REQUESTS)
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert _handler_counts() == handlers
+        # кэши ограничены, так что память не растет с числом запросов
+        assert current - baseline < 512 * 1024
+    finally:
+        await client.aclose()
+        await container.close()
+        await container.user_http_client.aclose()
+        await container.hackathon_http_client.aclose()
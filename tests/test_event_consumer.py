@@ -0,0 +1,92 @@
+from app.adapters.event_consumer.aiopika import AioPikaEventConsumerAdapter
+from types import SimpleNamespace
+import aio_pika
+import pytest
+import json
+
+pytestmark = pytest.mark.anyio
+
+
+class _Exchange:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.published: list[tuple[str, aio_pika.Message]] = []
+
+    async def publish(self, message: aio_pika.Message, routing_key: str):
+        if self.fail:
+            raise ConnectionError("channel closed")
+        self.published.append((routing_key, message))
+
+
+class _Message:
+    def __init__(self, payload: dict, headers: dict | None = None):
+        self.body = json.dumps(payload).encode()
+        self.headers = headers or {}
+        self.content_type = "application/json"
+        self.message_id = "event-1"
+        self.settled: list[tuple[str, bool | None]] = []
+
+    async def ack(self) -> None:
+        self.settled.append(("ack", None))
+
+    async def nack(self, requeue: bool = True) -> None:
+        self.settled.append(("nack", requeue))
+
+
+def _consumer(exchange: _Exchange) -> AioPikaEventConsumerAdapter:
+    consumer = AioPikaEventConsumerAdapter("amqp://", max_retries=2)
+    consumer._channel = SimpleNamespace(default_exchange=exchange)
+    consumer._retry_queue = SimpleNamespace(name="events.retry")
+    consumer._dead_queue = SimpleNamespace(name="events.dead")
+    return consumer
+
+
+async def test_handled_message_is_acked():
+    exchange = _Exchange()
+    message = _Message({"event_name": "user.deleted"})
+
+    await _consumer(exchange)._settle(message, None)  # type: ignore
+
+    assert message.settled == [("ack", None)]
+    assert exchange.published == []
+
+
+async def test_failed_message_is_delayed_and_then_parked():
+    exchange = _Exchange()
+    consumer = _consumer(exchange)
+
+    message = _Message({"event_name": "user.deleted"})
+    for _ in range(3):
+        await consumer._settle(message, RuntimeError())  # type: ignore
+        message.headers = exchange.published[-1][1].headers
+
+    assert [key for key, _ in exchange.published] == [
+        "events.retry",
+        "events.retry",
+        "events.dead",
+    ]
+    assert [m.headers["x-retries"] for _, m in exchange.published] == [1, 2, 3]
+    assert all(m.body == message.body for _, m in exchange.published)
+    assert message.settled == [("ack", None)] * 3
+
+
+async def test_undecodable_message_is_parked_without_retry():
+    exchange = _Exchange()
+    message = _Message({})
+
+    await _consumer(exchange)._settle(
+        message, ValueError(), retry=False  # type: ignore
+    )
+
+    assert [key for key, _ in exchange.published] == ["events.dead"]
+    assert message.settled == [("ack", None)]
+
+
+async def test_message_is_requeued_if_copy_cannot_be_published():
+    message = _Message({"event_name": "user.deleted"})
+
+    await _consumer(_Exchange(fail=True))._settle(
+        message, RuntimeError()  # type: ignore
+    )
+
+    assert message.settled == [("nack", True)]
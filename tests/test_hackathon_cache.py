@@ -0,0 +1,38 @@
+from app.adapters.hackathonservice.cached import (
+    CachedHackathonServiceAdapter,
+)
+from datetime import datetime, timedelta, timezone
+from tests.fakes import FakeHackathonService
+import asyncio
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_checks_are_answered_from_cached_dates():
+    upstream = FakeHackathonService()
+    cache = CachedHackathonServiceAdapter(
+        upstream, max_size=10, ttl=30.0, stale_ttl=300.0
+    )
+
+    assert await cache.can_edit_team_registry(1) is True
+    assert await cache.can_upload_submissions(1) is False
+    assert await cache.can_edit_team_registry(1) is True
+
+    assert upstream.calls == [("get_hackathon_data", 1)]
+
+
+async def test_stale_entry_is_served_and_refreshed_in_background():
+    upstream = FakeHackathonService()
+    cache = CachedHackathonServiceAdapter(
+        upstream, max_size=10, ttl=0.0, stale_ttl=300.0
+    )
+    await cache.get_hackathon_data(1)
+
+    # хакатон начался, но в кэше еще старые даты
+    upstream.start_date = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert await cache.can_edit_team_registry(1) is True
+
+    await asyncio.gather(*cache._refresh_tasks)
+    assert upstream.calls == [("get_hackathon_data", 1)] * 2
+    assert await cache.can_upload_submissions(1) is True
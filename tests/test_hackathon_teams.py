@@ -0,0 +1,208 @@
+from app.adapters.hackathonservice.cached import (
+    CachedHackathonServiceAdapter,
+)
+from app.services.hackathon_teams.service import HackathonTeamsService
+from app.events.emitter import BatchHandlers, Emitter, Events
+from tests.fakes import FakeHackathonService, FakeUserService
+from app.services.brand_team.service import TeamService
+from app.services.invite.service import InviteService
+from app.models.outbox import OutboxEventModel
+from app.events import dispatch_batch
+import pytest
+
+from app.models.hackathon_team import (
+    HackathonTeamMatesModel,
+    HackathonTeamModel,
+)
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("db")]
+
+HACKATHON_ID = 7
+
+
+@pytest.fixture
+async def brand_team_id(
+    team_service: TeamService, invite_service: InviteService
+) -> int:
+    team = await team_service.create("Team", 1)
+    for user_id in (2, 3):
+        await invite_service.invite_user(team.id, user_id)
+        await invite_service.accept(team.id, user_id)
+
+    return team.id
+
+
+@pytest.fixture
+async def hackathon_team_id(
+    hackathon_teams_service: HackathonTeamsService,
+    user_service: FakeUserService,
+    hackathon_upstream: FakeHackathonService,
+    brand_team_id: int,
+) -> int:
+    team = await hackathon_teams_service.create(
+        brand_team_id, HACKATHON_ID, [1, 2]
+    )
+    user_service.calls.clear()
+    hackathon_upstream.calls.clear()
+    return team.id
+
+
+async def test_add_mate_upstream_calls(
+    hackathon_teams_service: HackathonTeamsService,
+    user_service: FakeUserService,
+    hackathon_upstream: FakeHackathonService,
+    brand_team_id: int,
+    hackathon_team_id: int,
+):
+    await hackathon_teams_service.add_mate(brand_team_id, hackathon_team_id, 3)
+
+    # окно регистрации и лимиты берутся из закэшированного хакатона
+    assert user_service.calls == [("get_user_info_many", frozenset({3}))]
+    assert hackathon_upstream.calls == []
+    assert (
+        await HackathonTeamMatesModel.filter(team_id=hackathon_team_id).count()
+        == 3
+    )
+
+
+async def test_add_mate_cold_cache_upstream_calls(
+    hackathon_teams_service: HackathonTeamsService,
+    hackathon_service: CachedHackathonServiceAdapter,
+    hackathon_upstream: FakeHackathonService,
+    brand_team_id: int,
+    hackathon_team_id: int,
+):
+    hackathon_service.cache.clear()
+
+    await hackathon_teams_service.add_mate(brand_team_id, hackathon_team_id, 3)
+
+    assert hackathon_upstream.calls == [("get_hackathon_data", HACKATHON_ID)]
+
+
+async def test_remove_mate_upstream_calls(
+    hackathon_teams_service: HackathonTeamsService,
+    user_service: FakeUserService,
+    hackathon_upstream: FakeHackathonService,
+    hackathon_team_id: int,
+):
+    await hackathon_teams_service.remove_mate(HACKATHON_ID, 2)
+
+    assert user_service.calls == [("get_user_info", 2)]
+    assert hackathon_upstream.calls == []
+
+
+async def test_silent_remove_mate_skips_user_service(
+    hackathon_teams_service: HackathonTeamsService,
+    user_service: FakeUserService,
+    hackathon_upstream: FakeHackathonService,
+    hackathon_team_id: int,
+):
+    await hackathon_teams_service.remove_mate(HACKATHON_ID, 2, silent=True)
+
+    assert user_service.calls == []
+    assert hackathon_upstream.calls == []
+
+
+async def test_remove_last_mate_deletes_team(
+    hackathon_teams_service: HackathonTeamsService,
+    hackathon_upstream: FakeHackathonService,
+    hackathon_team_id: int,
+):
+    await hackathon_teams_service.remove_mate(HACKATHON_ID, 2, silent=True)
+    await hackathon_teams_service.remove_mate(HACKATHON_ID, 1, silent=True)
+
+    assert hackathon_upstream.calls == []
+    assert await hackathon_teams_service.get_mate_count(hackathon_team_id) == 0
+
+
+@pytest.fixture
+async def other_hackathon_team_id(
+    hackathon_teams_service: HackathonTeamsService,
+    team_service: TeamService,
+    invite_service: InviteService,
+) -> int:
+    brand_team = await team_service.create("Other team", 4)
+    await invite_service.invite_user(brand_team.id, 5)
+    await invite_service.accept(brand_team.id, 5)
+
+    team = await hackathon_teams_service.create(
+        brand_team.id, HACKATHON_ID, [4, 5]
+    )
+    return team.id
+
+
+@pytest.fixture
+def user_events(hackathon_teams_service: HackathonTeamsService):
+    hackathon_teams_service.init_events()
+    yield
+    Emitter.remove_all_listeners()
+    BatchHandlers.clear()
+
+
+def _user_event(event_name: Events, user_id: int, **data) -> dict:
+    return {"event_name": event_name, "data": {"id": user_id, **data}}
+
+
+@pytest.mark.usefixtures("user_events")
+async def test_removed_users_batch(
+    hackathon_teams_service: HackathonTeamsService,
+    hackathon_team_id: int,
+    other_hackathon_team_id: int,
+):
+    errors = await dispatch_batch(
+        [
+            _user_event(Events.UserDeleted, 4),
+            _user_event(Events.UserBanned, 5, is_banned=True),
+            _user_event(Events.UserBanned, 2, is_banned=False),
+        ]
+    )
+
+    assert errors == [None] * 3
+    assert set(
+        await HackathonTeamMatesModel.all().values_list("user_id", flat=True)
+    ) == {1, 2}
+
+    # опустевшая команда удалена, а событие об этом записано в outbox
+    assert not await HackathonTeamModel.exists(id=other_hackathon_team_id)
+    assert (
+        await OutboxEventModel.filter(
+            event_name=Events.TeamHackathonTeamDeleted
+        ).count()
+        == 1
+    )
+
+    assert (
+        await hackathon_teams_service.get_registered_users_count(HACKATHON_ID)
+        == await HackathonTeamMatesModel.filter(
+            team__hackathon_id=HACKATHON_ID
+        ).count()
+    )
+
+
+@pytest.mark.usefixtures("user_events")
+async def test_removed_users_errors_are_returned(
+    hackathon_service: CachedHackathonServiceAdapter,
+    hackathon_team_id: int,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    async def unavailable(hackathon_id: int) -> bool:
+        raise ConnectionError("hackathonservice is down")
+
+    monkeypatch.setattr(
+        hackathon_service, "can_edit_team_registry", unavailable
+    )
+
+    errors = await dispatch_batch(
+        [
+            _user_event(Events.UserDeleted, 1),
+            _user_event(Events.UserBanned, 3, is_banned=False),
+        ]
+    )
+
+    # консьюмер отложит на повтор только событие, которое не обработалось
+    assert isinstance(errors[0], ConnectionError)
+    assert errors[1] is None
+    assert (
+        await HackathonTeamMatesModel.filter(team_id=hackathon_team_id).count()
+        == 2
+    )
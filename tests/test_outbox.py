@@ -0,0 +1,121 @@
+from app.services.hackathon_teams.service import HackathonTeamsService
+from app.ports.event_publisher.dto import EventPayload
+from app.ports.event_publisher import IEventPublisherPort
+from tortoise.transactions import in_transaction
+from app.models.hackathon_team import HackathonTeamModel
+from app.models.outbox import OutboxEventModel
+from app.events.outbox import OutboxRelay
+from app.events.emitter import Events
+from pydantic import BaseModel
+import app.events.outbox as outbox
+import asyncio
+import pytest
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("db")]
+
+
+class _Publisher(IEventPublisherPort):
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.batches: list[list[EventPayload]] = []
+
+    async def connect(self) -> None:
+        pass
+
+    async def publish(self, event_name: str, data: BaseModel) -> None:
+        raise NotImplementedError
+
+    async def publish_batch(self, payloads: list[EventPayload]) -> None:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("broker is down")
+        self.batches.append(payloads)
+
+
+class _Data(BaseModel):
+    id: int
+
+
+class _Rollback(Exception):
+    pass
+
+
+async def _enqueue(count: int) -> list[int]:
+    for i in range(count):
+        await outbox.enqueue(Events.TeamHackathonTeamDeleted, _Data(id=i))
+
+    return list(
+        await OutboxEventModel.all().order_by("id").values_list("id", flat=True)
+    )
+
+
+async def _sent_ids() -> set[int]:
+    return set(
+        await OutboxEventModel.filter(sent_at__isnull=False).values_list(
+            "id", flat=True
+        )
+    )
+
+
+async def test_delete_team_writes_outbox_row(
+    hackathon_teams_service: HackathonTeamsService,
+):
+    team = await HackathonTeamModel.create(hackathon_id=7, name="Team")
+
+    await hackathon_teams_service.delete_team(team.id)
+
+    event = await OutboxEventModel.get()
+    assert event.event_name == Events.TeamHackathonTeamDeleted
+    assert event.data["id"] == team.id
+    assert event.sent_at is None
+
+
+async def test_delete_team_rollback_leaves_no_outbox_row(
+    hackathon_teams_service: HackathonTeamsService,
+):
+    team = await HackathonTeamModel.create(hackathon_id=7, name="Team")
+
+    with pytest.raises(_Rollback):
+        async with in_transaction():
+            await hackathon_teams_service.delete_team(team.id)
+            raise _Rollback()
+
+    assert await HackathonTeamModel.exists(id=team.id)
+    assert await OutboxEventModel.all().count() == 0
+
+
+@pytest.mark.parametrize(
+    "publisher, error",
+    [
+        (_Publisher(fail=True), ConnectionError),
+        (_Publisher(delay=1.0), TimeoutError),
+    ],
+)
+async def test_failed_publish_leaves_rows_unsent(
+    publisher: _Publisher, error: type[Exception]
+):
+    await _enqueue(3)
+    relay = OutboxRelay(publisher, publish_timeout=0.05)
+
+    with pytest.raises(error):
+        await relay.relay_once()
+
+    assert await _sent_ids() == set()
+    assert relay.published_total == 0
+
+
+async def test_relay_marks_exactly_the_batch_as_sent():
+    ids = await _enqueue(5)
+    publisher = _Publisher()
+    relay = OutboxRelay(publisher, batch_size=3)
+
+    assert await relay.relay_once() == 3
+
+    assert [p.data["id"] for p in publisher.batches[0]] == [0, 1, 2]
+    assert await _sent_ids() == set(ids[:3])
+    assert await relay.stats() == {
+        "pending": 2,
+        "published_total": 3,
+        "errors_total": 0,
+    }
@@ -0,0 +1,37 @@
+from app.ports.userservice.exceptions import UserNotFoundException
+from app.adapters.userservice import UserServiceAdapter
+import httpx
+import pytest
+import json
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_missing_user_is_not_found():
+    async def handle(request: httpx.Request) -> httpx.Response:
+        # сервис пользователей молча пропускает неизвестные ID
+        user_ids = json.loads(request.content)
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "id": user_id,
+                    "is_banned": False,
+                    "formatted_name": f"User {user_id}",
+                    "role": "user",
+                }
+                for user_id in user_ids
+                if user_id != 2
+            ],
+        )
+
+    adapter = UserServiceAdapter(
+        httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    )
+
+    user = await adapter.get_user_info(1)
+    assert user.formatted_name == "User 1"
+
+    with pytest.raises(UserNotFoundException) as e:
+        await adapter.get_user_info(2)
+    assert e.value.status_code == 404